@@ -4,26 +4,59 @@
 """
 
 import json
+import operator
 import os
 import re
-import glob
+import shutil
+import tempfile
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+
+# 项目扫描的目录层级（相对盘符根目录），'*' 匹配任意非隐藏目录，其余为固定目录名
+_ANIMATION_SCAN_SEGMENTS = ('*', 'publish', 'shot', '*', '*', 'element', 'ani', 'ani', 'cache', '*')
+_CFX_SCAN_SEGMENTS = ('*', 'cache', 'dcc', 'shot', '*', '*', 'cfx', 'alembic', '*', '*')
+
+
+
+def _shot_scan_segments(segments, sequence, shot):
+    """将扫描层级中 'shot' 之后的场次、镜头两级通配符替换为指定的场次和镜头"""
+    index = segments.index('shot') + 1
+    return segments[:index] + (sequence, shot) + segments[index + 2:]
+
+
+# 扫描时从路径/文件名提取信息用的固定正则（模块加载时编译一次）
+# 路径正则只作用于已统一为 '/' 分隔的路径
+_VERSION_RE = re.compile(r'/(v\d+)/')
+_ANIMATION_FILENAME_RE = re.compile(r'-(chr|prop|env|set|prp)_(\w+)_(\d+)\.(abc|ma)$')
+_CFX_TYPE_RE = re.compile(r'/cfx/alembic/(hair|cloth)/')
+_CFX_ASSET_RE = re.compile(r'/(chr_|)(\w+)_(\d+)/')
 
 
 class ConfigManager:
     """配置管理类"""
     
-    def __init__(self, config_file=None):
+    # 单镜头扫描结果的缓存有效期（秒）
+    _SHOT_CACHE_TTL = 60.0
+    # 可用盘符检查结果的缓存有效期（秒）
+    _DRIVES_CACHE_TTL = 30.0
+    
+    def __init__(self, config_file=None, verbose=False):
         """
         初始化配置管理器
         
         Args:
             config_file (str): JSON配置文件路径
+            verbose (bool): 扫描时是否逐个镜头输出过滤详情
         """
         self.config_file = config_file
+        self.verbose = verbose
         self.assets_data = []
+        self._asset_by_name = None  # 资产名称 -> 资产配置索引，按需构建
+        self._asset_index_source = None  # 构建索引时对应的assets_data列表
+        self._shot_cache = {}  # 单镜头扫描缓存 {镜头键: (扫描时间, 动画文件列表)}
+        self._drives_cache = (0.0, (), [])  # 可用盘符缓存 (检查时间, 配置的盘符, 可用盘符列表)
         self.base_paths = {
             'assets_root': 'P:\\LHSN\\assets',
             'publish_root': 'P:\\LHSN\\publish',
@@ -42,6 +75,7 @@ class ConfigManager:
             'required_assets': ['chr', 'set', 'prp', 'env', 'prop'],  # 必需的资产类型（包含所有资产类型）
             'min_assets_per_shot': 1  # 每个镜头最少资产数量
         }
+        self._recompile_patterns()
         
         if config_file and os.path.exists(config_file):
             self.load_config(config_file)
@@ -57,8 +91,10 @@ class ConfigManager:
             bool: 是否加载成功
         """
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                self.assets_data = json.load(f)
+            # 整体读入字节后一次解析（json.loads可直接识别UTF-8及BOM）
+            with open(config_file, 'rb') as f:
+                self.assets_data = json.loads(f.read())
+            self._asset_by_name = None
             
             print(f"成功加载配置文件: {config_file}")
             print(f"包含 {len(self.assets_data)} 个资产配置")
@@ -108,10 +144,36 @@ class ConfigManager:
         Returns:
             dict: 资产配置，如果不存在返回None
         """
+        return self._get_asset_index().get(asset_name)
+    
+    def _get_asset_index(self):
+        """
+        获取资产名称索引，assets_data被替换后自动重建
+        
+        Returns:
+            dict: 资产名称 -> 资产配置（同名时保留第一个）
+        """
+        if self._asset_by_name is None or self._asset_index_source is not self.assets_data:
+            index = {}
+            for asset in self.assets_data:
+                index.setdefault(asset.get('asset_name'), asset)
+            self._asset_by_name = index
+            self._asset_index_source = self.assets_data
+        return self._asset_by_name
+    
+    def iter_animation_files(self):
+        """
+        逐个产出所有动画文件路径（包含ABC和Maya文件）
+        
+        只需遍历一次时优先使用本方法，避免生成完整列表
+        
+        Yields:
+            str: 动画文件路径
+        """
         for asset in self.assets_data:
-            if asset.get('asset_name') == asset_name:
-                return asset
-        return None
+            for output_path in asset.get('outputs', ()):
+                if output_path.endswith(('.abc', '.ma')):
+                    yield output_path
     
     def get_all_animation_files(self):
         """
@@ -120,14 +182,7 @@ class ConfigManager:
         Returns:
             list: 动画文件路径列表
         """
-        animation_files = []
-        for asset in self.assets_data:
-            outputs = asset.get('outputs', [])
-            for output_path in outputs:
-                if output_path.endswith(('.abc', '.ma')):
-                    animation_files.append(output_path)
-        
-        return animation_files
+        return list(self.iter_animation_files())
     
     def set_hair_cache_template(self, template):
         """
@@ -189,9 +244,25 @@ class ConfigManager:
         Returns:
             bool: 是否导出成功
         """
+        temp_file = None
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(self.assets_data, f, indent=4, ensure_ascii=False)
+            # 先在内存中整体序列化再一次写入，避免json.dump逐片段写入文本流
+            content = json.dumps(self.assets_data, indent=4, ensure_ascii=False)
+            
+            # 写入同目录下的临时文件后再替换目标文件，中途失败不会留下写了一半的配置
+            fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_file)), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content.encode('utf-8'))
+            
+            # mkstemp创建的文件权限为0600：沿用目标文件原有权限，新文件按umask设置默认权限
+            if os.path.exists(output_file):
+                shutil.copymode(output_file, temp_file)
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(temp_file, 0o666 & ~umask)
+            os.replace(temp_file, output_file)
+            temp_file = None
             
             print(f"配置文件已导出到: {output_file}")
             return True
@@ -199,6 +270,13 @@ class ConfigManager:
         except Exception as e:
             print(f"导出配置文件失败: {str(e)}")
             return False
+            
+        finally:
+            if temp_file:
+                try:
+                    os.remove(temp_file)
+                except OSError:
+                    pass
     
     def scan_project_animation_files(self, progress_callback=None):
         """
@@ -213,6 +291,9 @@ class ConfigManager:
         print("🔍 开始多线程扫描项目动画文件...")
         start_time = time.time()
         
+        # 扫描配置可能在构造后被修改，扫描前按当前配置编译一次
+        self._recompile_patterns()
+        
         # 获取可用盘符
         available_drives = self._get_available_drives()
         if not available_drives:
@@ -221,6 +302,11 @@ class ConfigManager:
         
         print(f"🎯 发现可用盘符: {available_drives}")
         
+        # 按盘符下的项目目录拆分扫描任务，单个盘符时也能让线程池并行访问网络盘
+        project_dirs = []
+        for drive in available_drives:
+            project_dirs.extend(self._list_project_dirs(drive))
+        
         # 使用线程池扫描
         max_workers = self.project_scan_config['max_workers']
         all_shot_data = {}
@@ -228,40 +314,40 @@ class ConfigManager:
         
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # 提交扫描任务
-            future_to_drive = {
-                executor.submit(self._scan_single_drive, drive, progress_callback): drive 
-                for drive in available_drives
+            future_to_dir = {
+                executor.submit(self._scan_project_dir, project_dir): project_dir
+                for project_dir in project_dirs
             }
             
             completed = 0
-            for future in as_completed(future_to_drive):
-                drive = future_to_drive[future]
+            for future in as_completed(future_to_dir):
+                project_dir = future_to_dir[future]
                 completed += 1
                 
                 try:
-                    drive_result = future.result()
-                    if drive_result:
-                        drive_shot_data, drive_files_count = drive_result
+                    dir_result = future.result()
+                    if dir_result:
+                        dir_shot_data, dir_files_count = dir_result
                         
-                        # 合并结果
-                        for shot_key, shot_data in drive_shot_data.items():
-                            if shot_key not in all_shot_data:
-                                all_shot_data[shot_key] = shot_data
-                            else:
-                                # 合并同一镜头的数据
-                                all_shot_data[shot_key] = self._merge_shot_data(all_shot_data[shot_key], shot_data)
+                        # 合并结果：首次出现的镜头直接采用，之后同一镜头的数据原地并入
+                        for shot_key, shot_data in dir_shot_data.items():
+                            merged = all_shot_data.setdefault(shot_key, shot_data)
+                            if merged is not shot_data:
+                                merged['animation_files'].extend(shot_data['animation_files'])
+                                merged['assets'] |= shot_data['assets']
+                                merged['versions'] |= shot_data['versions']
                         
-                        total_files += drive_files_count
-                        print(f"  ✅ 完成盘符 {drive}: {drive_files_count} 个文件")
+                        total_files += dir_files_count
+                        print(f"  ✅ 完成目录 {project_dir}: {dir_files_count} 个文件")
                     else:
-                        print(f"  ❌ 盘符 {drive} 扫描失败")
+                        print(f"  ❌ 目录 {project_dir} 扫描失败")
                         
                 except Exception as e:
-                    print(f"  ❌ 盘符 {drive} 扫描异常: {str(e)}")
+                    print(f"  ❌ 目录 {project_dir} 扫描异常: {str(e)}")
                 
                 # 更新进度
                 if progress_callback:
-                    progress_callback(completed, len(available_drives), f"已完成 {completed}/{len(available_drives)} 个盘符扫描")
+                    progress_callback(completed, len(project_dirs), f"已完成 {completed}/{len(project_dirs)} 个目录扫描")
         
         # 后处理：版本过滤和资产完整性验证
         print("🔧 开始后处理...")
@@ -289,9 +375,9 @@ class ConfigManager:
         """
         shot_key = f"{sequence}_{shot}"
         
-        # 如果没有提供数据，则重新扫描
+        # 如果没有提供数据，只扫描该镜头的目录，无需全盘扫描
         if shot_data is None:
-            shot_data = self.scan_project_animation_files()
+            return self._scan_single_shot(sequence, shot)
         
         if shot_key in shot_data:
             return shot_data[shot_key]['animation_files']
@@ -318,30 +404,34 @@ class ConfigManager:
                 print(f"未找到 {sequence}_{shot} 的动画文件")
                 return False
             
-            # 按资产组织文件
+            # 按资产组织文件，以 (资产类型, 资产名称) 为键
+            selected = frozenset(selected_assets) if selected_assets else None
             assets_dict = {}
             for file_info in animation_files:
-                asset_key = f"{file_info['asset_type']}_{file_info['asset_name']}"
+                asset_type = file_info['asset_type']
+                asset_name = file_info['asset_name']
                 
                 # 如果指定了选中资产，只处理选中的
-                if selected_assets and asset_key not in selected_assets:
+                if selected is not None and f"{asset_type}_{asset_name}" not in selected:
                     continue
                 
-                if asset_key not in assets_dict:
-                    assets_dict[asset_key] = {
-                        'asset_name': file_info['asset_name'],
-                        'asset_type': file_info['asset_type'],
-                        'asset_type_group_name': file_info['asset_type'],
+                asset = assets_dict.get((asset_type, asset_name))
+                if asset is None:
+                    asset = assets_dict[(asset_type, asset_name)] = {
+                        'asset_name': asset_name,
+                        'asset_type': asset_type,
+                        'asset_type_group_name': asset_type,
                         'outputs': []
                     }
                 
-                assets_dict[asset_key]['outputs'].append(file_info['path'])
+                asset['outputs'].append(file_info['path'])
             
             # 转换为配置格式
             self.assets_data = list(assets_dict.values())
             
             # 按资产名称排序
             self.assets_data.sort(key=lambda x: x['asset_name'])
+            self._asset_by_name = None
             
             print(f"✅ 已创建 {sequence}_{shot} 的配置，包含 {len(self.assets_data)} 个资产")
             
@@ -351,214 +441,270 @@ class ConfigManager:
             print(f"❌ 创建配置失败: {str(e)}")
             return False
     
-    def _filter_latest_version_files(self, shot_data):
+    def _recompile_patterns(self):
+        """按project_scan_config编译扫描用的正则，修改扫描配置后需重新调用"""
+        self._re_shot = re.compile(self.project_scan_config['shot_pattern'])
+        # 动画/CFX路径模式合并为一个分支正则，一次匹配即可由lastgroup得知文件类型
+        self._re_path_kind = re.compile('(?P<animation>%s)|(?P<cfx>%s)' % (
+            self.project_scan_config['animation_path_pattern'],
+            self.project_scan_config['cfx_path_pattern']
+        ))
+    
+    def _get_available_drives(self):
+        """获取可用的扫描盘符，结果按_DRIVES_CACHE_TTL缓存（未挂载的网络盘检查很慢）"""
+        scan_drives = tuple(self.project_scan_config['scan_drives'])
+        checked_at, cached_drives, available_drives = self._drives_cache
+        if cached_drives == scan_drives and time.time() - checked_at < self._DRIVES_CACHE_TTL:
+            return list(available_drives)
+        
+        available_drives = [drive for drive in scan_drives if os.path.exists(drive + '\\')]
+        self._drives_cache = (time.time(), scan_drives, available_drives)
+        return list(available_drives)
+    
+    def _scan_single_shot(self, sequence, shot):
         """
-        过滤出最新版本的动画文件
+        只扫描指定场次镜头的目录，结果按_SHOT_CACHE_TTL缓存
         
         Args:
-            shot_data (dict): 场次镜头数据
+            sequence (str): 场次，如 's310'
+            shot (str): 镜头，如 'c0990'
             
         Returns:
-            dict: 过滤后的场次镜头数据（只包含最新版本）
+            list: 动画文件信息列表（与全盘扫描相同的版本过滤和完整性过滤）
         """
-        try:
-            # 找到最新版本
-            versions = shot_data.get('versions', set())
-            if not versions:
-                return shot_data
-            
-            # 解析版本号并排序
-            version_numbers = []
-            for version in versions:
-                if version.startswith('v') and version[1:].isdigit():
-                    version_numbers.append(int(version[1:]))
-            
-            if not version_numbers:
-                return shot_data
-            
-            # 获取最新版本号
-            latest_version_num = max(version_numbers)
-            latest_version = f"v{latest_version_num:03d}"  # 格式化为v001, v002等
-            
-            print(f"    🔍 场次 {shot_data['display_name']}: 发现版本 {sorted(versions)}, 选择最新版本 {latest_version}")
-            
-            # 过滤出最新版本的文件
-            latest_files = []
-            for file_info in shot_data.get('animation_files', []):
-                if file_info.get('version') == latest_version:
-                    latest_files.append(file_info)
-            
-            # 更新数据
-            filtered_shot_data = shot_data.copy()
-            filtered_shot_data['animation_files'] = latest_files
-            filtered_shot_data['versions'] = {latest_version}  # 只保留最新版本
-            
-            # 重新统计资产（基于最新版本的文件）
-            assets = set()
-            for file_info in latest_files:
-                asset_type = file_info.get('asset_type', 'unknown')
-                asset_name = file_info.get('asset_name', 'unknown')
-                assets.add(f"{asset_type}_{asset_name}")
-            
-            filtered_shot_data['assets'] = assets
-            
-            print(f"    ✅ 过滤完成: {len(shot_data['animation_files'])} → {len(latest_files)} 个文件")
-            
-            return filtered_shot_data
-            
-        except Exception as e:
-            print(f"    ❌ 过滤版本失败: {str(e)}")
-            return shot_data
+        shot_key = f"{sequence}_{shot}"
+        
+        cached = self._shot_cache.get(shot_key)
+        if cached and time.time() - cached[0] < self._SHOT_CACHE_TTL:
+            return cached[1]
+        
+        print(f"🔍 扫描镜头 {shot_key} 的动画文件...")
+        self._recompile_patterns()
+        
+        animation_segments = _shot_scan_segments(_ANIMATION_SCAN_SEGMENTS, sequence, shot)
+        cfx_segments = _shot_scan_segments(_CFX_SCAN_SEGMENTS, sequence, shot)
+        all_files = chain.from_iterable(
+            chain(
+                self._iter_scan_files(drive + os.sep, animation_segments),
+                self._iter_scan_files(drive + os.sep, cfx_segments)
+            )
+            for drive in self._get_available_drives()
+        )
+        
+        shot_data, files_count = self._classify_scan_files(all_files)
+        shot_data = self._filter_complete_shots(self._post_process_shot_data(shot_data, files_count))
+        
+        animation_files = shot_data[shot_key]['animation_files'] if shot_key in shot_data else []
+        self._shot_cache[shot_key] = (time.time(), animation_files)
+        return animation_files
     
-    def _get_available_drives(self):
-        """获取可用的扫描盘符"""
-        available_drives = []
-        for drive in self.project_scan_config['scan_drives']:
-            if os.path.exists(drive + '\\'):
-                available_drives.append(drive)
-        return available_drives
+    def _list_project_dirs(self, drive):
+        """列出盘符根目录下的项目目录（扫描层级的第一层 '*'）"""
+        try:
+            with os.scandir(drive + os.sep) as entries:
+                return [entry.path for entry in entries
+                        if not entry.name.startswith('.') and entry.is_dir()]
+        except OSError as e:
+            print(f"    ❌ 读取盘符 {drive} 失败: {str(e)}")
+            return []
     
-    def _scan_single_drive(self, drive, progress_callback=None):
-        """扫描单个盘符"""
+    def _scan_project_dir(self, project_dir):
+        """扫描单个项目目录"""
         try:
-            print(f"  🔍 开始扫描盘符: {drive}")
-            
-            shot_data = {}
-            files_count = 0
-            
-            # 编译正则表达式
-            shot_pattern = re.compile(self.project_scan_config['shot_pattern'])
-            animation_pattern = re.compile(self.project_scan_config['animation_path_pattern'])
-            cfx_pattern = re.compile(self.project_scan_config['cfx_path_pattern'])
+            # 扫描publish目录结构（动画文件）和cache目录结构（CFX文件），
+            # 逐层只进入匹配的目录，文件大小直接取自目录项，无需再次stat
+            all_files = chain(
+                self._iter_scan_files(project_dir, _ANIMATION_SCAN_SEGMENTS[1:]),
+                self._iter_scan_files(project_dir, _CFX_SCAN_SEGMENTS[1:])
+            )
+            return self._classify_scan_files(all_files)
             
-            # 扫描publish目录结构 - 动画文件
-            publish_pattern = os.path.join(drive, '*', 'publish', 'shot', '*', '*', 'element', 'ani', 'ani', 'cache', '*', '*.abc')
-            abc_files = glob.glob(publish_pattern)
-            
-            # 扫描cache目录结构 - CFX文件
-            cfx_pattern_path = os.path.join(drive, '*', 'cache', 'dcc', 'shot', '*', '*', 'cfx', 'alembic', '*', '*', '*.abc')
-            cfx_files = glob.glob(cfx_pattern_path)
-            
-            # 合并所有文件
-            all_files = abc_files + cfx_files
+        except Exception as e:
+            print(f"    ❌ 扫描目录 {project_dir} 失败: {str(e)}")
+            return None
+    
+    def _classify_scan_files(self, all_files):
+        """
+        按场次镜头整理扫描到的动画和CFX文件
+        
+        Args:
+            all_files (iterable): (文件路径, 文件大小) 序列
             
-            for file_path in all_files:
-                # 标准化路径
-                normalized_path = file_path.replace('\\', '/')
-                
-                # 匹配场次和镜头
-                shot_match = shot_pattern.search(normalized_path)
-                if not shot_match:
-                    continue
-                
-                # 判断文件类型 - 动画文件或CFX文件
-                is_animation = animation_pattern.match(file_path)
-                is_cfx = cfx_pattern.match(file_path)
-                
-                if not is_animation and not is_cfx:
-                    continue
-                
-                sequence = shot_match.group(1)  # s310
-                shot = shot_match.group(2)      # c0990
-                shot_key = f"{sequence}_{shot}"
-                
-                # 提取版本信息
-                if is_animation:
-                    version_match = re.search(r'[/\\](v\d+)[/\\]', normalized_path)
-                    version = version_match.group(1) if version_match else 'unknown'
-                else:  # CFX文件可能没有版本号，使用默认
-                    version = 'v001'
-                
-                # 提取资产信息
-                filename = os.path.basename(file_path)
-                
-                if is_animation:
-                    # 动画文件: LHSN_s310_c0990_ani_ani_v002-chr_dwl_01.abc
-                    asset_match = re.search(r'-(chr|prop|env|set|prp)_(\w+)_(\d+)\.(abc|ma)$', filename)
-                    asset_type = asset_match.group(1) if asset_match else 'unknown'
-                    asset_name = asset_match.group(2) if asset_match else 'unknown'  
-                    asset_index = asset_match.group(3) if asset_match else '01'
-                elif is_cfx:
-                    # CFX文件: cache_dwl_01.abc 或类似格式
-                    # 从路径中提取资产信息: /cfx/alembic/hair/dwl_01/
-                    cfx_type_match = re.search(r'[/\\]cfx[/\\]alembic[/\\](hair|cloth)[/\\]', normalized_path)
-                    cfx_asset_match = re.search(r'[/\\](chr_|)(\w+)_(\d+)[/\\]', normalized_path)
-                    
-                    if cfx_type_match and cfx_asset_match:
-                        cfx_type = cfx_type_match.group(1)  # hair or cloth
-                        asset_type = 'chr'  # CFX通常用于角色
-                        asset_name = cfx_asset_match.group(2)  # dwl
-                        asset_index = cfx_asset_match.group(3)  # 01
-                    else:
-                        asset_type = 'cfx'
-                        asset_name = 'unknown'
-                        asset_index = '01'
-                
-                # 组织数据
-                if shot_key not in shot_data:
-                    shot_data[shot_key] = {
-                        'sequence': sequence,
-                        'shot': shot,
-                        'display_name': shot_key,
-                        'animation_files': [],
-                        'assets': set(),
-                        'versions': set()
-                    }
+        Returns:
+            tuple: (按场次镜头组织的数据, 文件数量)
+        """
+        shot_data = {}
+        files_count = 0
+        
+        shot_pattern = self._re_shot
+        path_kind_pattern = self._re_path_kind
+        
+        for file_path, file_size in all_files:
+            # 标准化路径（只计算一次，后续的固定正则和文件名都基于它）
+            normalized_path = file_path.replace('\\', '/')
+            
+            # 匹配场次和镜头
+            shot_match = shot_pattern.search(normalized_path)
+            if not shot_match:
+                continue
+            
+            # 判断文件类型 - 动画文件或CFX文件（动画模式优先）
+            kind_match = path_kind_pattern.match(file_path)
+            if not kind_match:
+                continue
+            is_animation = kind_match.lastgroup == 'animation'
+            is_cfx = not is_animation
+            
+            sequence = shot_match.group(1)  # s310
+            shot = shot_match.group(2)      # c0990
+            shot_key = f"{sequence}_{shot}"
+            
+            # 提取版本信息
+            if is_animation:
+                version_match = _VERSION_RE.search(normalized_path)
+                version = version_match.group(1) if version_match else 'unknown'
+            else:  # CFX文件可能没有版本号，使用默认
+                version = 'v001'
+            # 版本号数值，无法解析时为-1（用于最新版本过滤）
+            version_num = int(version[1:]) if version[1:].isdigit() else -1
+            
+            # 提取资产信息
+            filename = normalized_path.rpartition('/')[2]
+            
+            if is_animation:
+                # 动画文件: LHSN_s310_c0990_ani_ani_v002-chr_dwl_01.abc
+                asset_match = _ANIMATION_FILENAME_RE.search(filename)
+                asset_type = asset_match.group(1) if asset_match else 'unknown'
+                asset_name = asset_match.group(2) if asset_match else 'unknown'  
+                asset_index = asset_match.group(3) if asset_match else '01'
+            elif is_cfx:
+                # CFX文件: cache_dwl_01.abc 或类似格式
+                # 从路径中提取资产信息: /cfx/alembic/hair/dwl_01/
+                cfx_type_match = _CFX_TYPE_RE.search(normalized_path)
+                cfx_asset_match = _CFX_ASSET_RE.search(normalized_path)
                 
-                # 添加文件信息
-                file_info = {
-                    'path': file_path,
-                    'filename': filename,
-                    'asset_type': asset_type,
-                    'asset_name': asset_name,
-                    'asset_index': asset_index,
-                    'version': version,
-                    'file_type': 'cfx' if is_cfx else 'animation',
-                    'size': os.path.getsize(file_path) if os.path.exists(file_path) else 0
+                if cfx_type_match and cfx_asset_match:
+                    cfx_type = cfx_type_match.group(1)  # hair or cloth
+                    asset_type = 'chr'  # CFX通常用于角色
+                    asset_name = cfx_asset_match.group(2)  # dwl
+                    asset_index = cfx_asset_match.group(3)  # 01
+                else:
+                    asset_type = 'cfx'
+                    asset_name = 'unknown'
+                    asset_index = '01'
+            
+            # 组织数据
+            if shot_key not in shot_data:
+                shot_data[shot_key] = {
+                    'sequence': sequence,
+                    'shot': shot,
+                    'display_name': shot_key,
+                    'animation_files': [],
+                    'assets': set(),
+                    'versions': set()
                 }
-                
-                # 为CFX文件添加额外信息
-                if is_cfx and 'cfx_type' in locals():
-                    file_info['cfx_type'] = cfx_type  # hair 或 cloth
-                
-                shot_data[shot_key]['animation_files'].append(file_info)
-                shot_data[shot_key]['assets'].add(f"{asset_type}_{asset_name}")
-                shot_data[shot_key]['versions'].add(version)
-                files_count += 1
             
-            return shot_data, files_count
+            # 添加文件信息
+            file_info = {
+                'path': file_path,
+                'filename': filename,
+                'asset_type': asset_type,
+                'asset_name': asset_name,
+                'asset_index': asset_index,
+                'version': version,
+                'version_num': version_num,
+                'file_type': 'cfx' if is_cfx else 'animation',
+                'size': file_size
+            }
             
-        except Exception as e:
-            print(f"    ❌ 扫描盘符 {drive} 失败: {str(e)}")
-            return None
+            # 为CFX文件添加额外信息
+            if is_cfx and 'cfx_type' in locals():
+                file_info['cfx_type'] = cfx_type  # hair 或 cloth
+            
+            shot_data[shot_key]['animation_files'].append(file_info)
+            shot_data[shot_key]['assets'].add(f"{asset_type}_{asset_name}")
+            shot_data[shot_key]['versions'].add(version)
+            files_count += 1
+        
+        return shot_data, files_count
     
-    def _merge_shot_data(self, data1, data2):
-        """合并两个镜头数据"""
+    def _iter_scan_files(self, root, segments, suffix='.abc'):
+        """
+        按目录层级逐层扫描文件（替代多级通配符glob）
+        
+        只进入与当前层级匹配的目录，到达最后一层后产出指定后缀的文件；
+        目录项自带类型和大小信息，网络盘上无需对每个文件额外stat
+        
+        Args:
+            root (str): 起始目录
+            segments (tuple): 目录层级，'*' 匹配任意非隐藏目录，其余为固定目录名
+            suffix (str): 文件后缀
+            
+        Yields:
+            tuple: (文件路径, 文件大小)
+        """
         try:
-            merged = data1.copy()
-            merged['animation_files'].extend(data2['animation_files'])
-            merged['assets'].update(data2['assets'])
-            merged['versions'].update(data2['versions'])
-            return merged
-        except Exception as e:
-            print(f"    ❌ 合并镜头数据失败: {str(e)}")
-            return data1
+            with os.scandir(root) as entries:
+                entries = list(entries)
+        except OSError:
+            return
+        
+        if not segments:
+            suffix = os.path.normcase(suffix)
+            for entry in entries:
+                try:
+                    if os.path.normcase(entry.name).endswith(suffix) and entry.is_file():
+                        yield entry.path, entry.stat().st_size
+                except OSError:
+                    continue
+            return
+        
+        segment = os.path.normcase(segments[0])
+        for entry in entries:
+            if segment == '*':
+                if entry.name.startswith('.'):
+                    continue
+            elif os.path.normcase(entry.name) != segment:
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                yield from self._iter_scan_files(entry.path, segments[1:], suffix)
     
     def _post_process_shot_data(self, shot_data, total_files):
         """后处理镜头数据"""
         print("  📋 版本过滤和数据整理...")
         
+        by_filename = operator.itemgetter('filename')
+        
         # 处理每个场次镜头的数据
-        for shot_key in shot_data:
-            # 只保留最新版本的动画文件
-            shot_data[shot_key] = self._filter_latest_version_files(shot_data[shot_key])
+        for data in shot_data.values():
+            files = data['animation_files']
+            
+            # 只保留最新版本的动画文件（扫描时已解析出version_num，无法解析的为-1）
+            latest_version_num = max((file_info['version_num'] for file_info in files), default=-1)
+            if latest_version_num >= 0:
+                latest_files = [file_info for file_info in files
+                                if file_info['version_num'] == latest_version_num]
+                latest_versions = {file_info['version'] for file_info in latest_files}
+                
+                if self.verbose:
+                    print(f"    🔍 场次 {data['display_name']}: 发现版本 {sorted(data['versions'])}, 选择最新版本 {', '.join(sorted(latest_versions))}")
+                    print(f"    ✅ 过滤完成: {len(files)} → {len(latest_files)} 个文件")
+                
+                # 基于最新版本的文件重新统计版本和资产
+                files = data['animation_files'] = latest_files
+                data['versions'] = latest_versions
+                data['assets'] = {f"{file_info['asset_type']}_{file_info['asset_name']}" for file_info in latest_files}
             
             # 转换set为sorted list
-            shot_data[shot_key]['assets'] = sorted(list(shot_data[shot_key]['assets']))
-            shot_data[shot_key]['versions'] = sorted(list(shot_data[shot_key]['versions']))
+            data['assets'] = sorted(data['assets'])
+            data['versions'] = sorted(data['versions'])
             
             # 按文件名排序
-            shot_data[shot_key]['animation_files'].sort(key=lambda x: x['filename'])
+            files.sort(key=by_filename)
         
         # 重新计算过滤后的文件总数
         filtered_total_files = sum(len(data['animation_files']) for data in shot_data.values())
@@ -573,26 +719,23 @@ class ConfigManager:
         
         complete_shots = {}
         required_assets = self.project_scan_config['required_assets']
+        required_types = frozenset(required_assets)
         min_assets = self.project_scan_config['min_assets_per_shot']
         
         for shot_key, data in shot_data.items():
             assets = data.get('assets', [])
             
-            # 检查是否有必需的资产类型
-            has_required_assets = False
-            for asset in assets:
-                asset_type = asset.split('_')[0]  # chr_dwl → chr
-                if asset_type in required_assets:
-                    has_required_assets = True
-                    break
+            # 检查是否有必需的资产类型（chr_dwl → chr）
+            has_required_assets = any(asset.partition('_')[0] in required_types for asset in assets)
             
             # 检查资产数量
             has_enough_assets = len(assets) >= min_assets
             
             if has_required_assets and has_enough_assets:
                 complete_shots[shot_key] = data
-                print(f"    ✅ {shot_key}: {len(assets)}个资产 {assets}")
-            else:
+                if self.verbose:
+                    print(f"    ✅ {shot_key}: {len(assets)}个资产 {assets}")
+            elif self.verbose:
                 print(f"    ❌ {shot_key}: 资产不完整 ({len(assets)}个资产, 需要{required_assets}类型)")
         
         print(f"  🎯 完整镜头过滤: {len(shot_data)} → {len(complete_shots)} 个镜头")
@@ -603,7 +746,9 @@ class ConfigManager:
             for shot_key, data in sorted(complete_shots.items())[:10]:  # 显示前10个
                 asset_count = len(data['assets'])
                 file_count = len(data['animation_files'])
-                versions = ', '.join(data['versions'])
+                versions = ', '.join(data['versions'][:3])
+                if len(data['versions']) > 3:
+                    versions += ', ...'
                 print(f"  {shot_key}: {file_count}文件, {asset_count}资产, 版本[{versions}]")
             
             if len(complete_shots) > 10:
@@ -3,36 +3,142 @@
 负责协调各个管理器的执行流程和状态管理
 """
 
-# 简化的直接导入
-from managers.lookdev_manager import LookdevManager
-from managers.animation_manager import AnimationManager
-from managers.abc_importer import ABCImporter
-from managers.scene_manager import SceneManager
-from managers.material_manager import MaterialManager
-from managers.xgen_manager import XGenManager
+import heapq
+import time
+from functools import lru_cache
+
+# 状态图标，按 bool 索引
+_STATUS_ICON = ("❌", "✅")
+
+
+class _Status:
+    """组装状态位"""
+    LOOKDEV = 1
+    ANIM = 2
+    CAM = 4
+    HAIR = 8
+    MAT = 16
+    SCENE = 32
+
+
+# 状态键与状态位的对应关系（顺序即对外显示顺序）
+_STATUS_KEYS = (
+    ('lookdev_imported', _Status.LOOKDEV),
+    ('animation_connected', _Status.ANIM),
+    ('camera_imported', _Status.CAM),
+    ('hair_configured', _Status.HAIR),
+    ('materials_fixed', _Status.MAT),
+    ('scene_configured', _Status.SCENE),
+)
+
+# 验证组装时必须完成的步骤
+_REQUIRED_MASK = _Status.ANIM | _Status.CAM
+
+
+@lru_cache(maxsize=64)
+def _resolve_hair_cache_path(template, sequence, shot, namespace):
+    """
+    根据模板生成毛发缓存路径（批量组装时同一镜头会重复调用）
+    
+    Args:
+        template (str): 毛发缓存模板
+        sequence (str): 场景
+        shot (str): 镜头
+        namespace (str): Lookdev命名空间
+        
+    Returns:
+        str: 毛发缓存路径
+    """
+    return template.format(sequence=sequence, shot=shot, lookdev_namespace=namespace.replace("_lookdev", ''))
+
+
+def _step_successors(step_deps):
+    """
+    计算每个步骤的后续步骤
+    
+    Args:
+        step_deps (dict): {步骤名: (前置步骤名, ...)}
+        
+    Returns:
+        dict: {步骤名: [后续步骤名, ...]}
+    """
+    successors = {name: [] for name in step_deps}
+    for name, deps in step_deps.items():
+        for dep in deps:
+            successors[dep].append(name)
+    return successors
+
+
+def _topological_order(step_deps):
+    """
+    按依赖关系计算步骤执行顺序（Kahn算法）
+    
+    Args:
+        step_deps (dict): {步骤名: (前置步骤名, ...)}，按声明顺序排列
+        
+    Returns:
+        tuple: 排序后的步骤名，可同时执行的步骤保持声明顺序
+    """
+    names = list(step_deps)
+    index = {name: i for i, name in enumerate(names)}
+    in_degree = {name: len(deps) for name, deps in step_deps.items()}
+    successors = _step_successors(step_deps)
+
+    # 入度为0的步骤按声明顺序出队
+    ready = [index[name] for name in names if in_degree[name] == 0]
+    heapq.heapify(ready)
+
+    order = []
+    while ready:
+        name = names[heapq.heappop(ready)]
+        order.append(name)
+        for successor in successors[name]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                heapq.heappush(ready, index[successor])
+
+    if len(order) != len(names):
+        raise ValueError("步骤依赖存在循环")
+
+    return tuple(order)
 
 
 class AssemblyCoordinator:
     """组装协调器"""
 
+    # 步骤执行计划：(方法名, 参数对应的配置键, 前置步骤)
+    # 相机导入不依赖Lookdev；场景设置不依赖其他步骤，总会执行（按声明顺序排在最后）
+    _STEP_PLAN = (
+        ('step1_import_lookdev', ('lookdev_file', 'lookdev_namespace'), ()),
+        ('step2_import_and_connect_animations',
+         ('animation_files', 'lookdev_namespace', 'animation_namespace', 'sequence', 'shot'),
+         ('step1_import_lookdev',)),
+        ('step3_import_camera', ('camera_file',), ()),
+        ('step4_setup_hair_cache', ('hair_cache_template', 'sequence', 'shot', 'lookdev_namespace'),
+         ('step1_import_lookdev',)),
+        ('step5_fix_materials', (), ('step1_import_lookdev',)),
+        ('step6_setup_scene', ('start_frame', 'end_frame', 'lookdev_namespace'), ()),
+    )
+    _STEP_DEPS = {name: deps for name, _, deps in _STEP_PLAN}
+    _STEP_ARG_KEYS = {name: arg_keys for name, arg_keys, _ in _STEP_PLAN}
+    # 可以不提供的配置键（缺省为None），其余键缺失时抛出KeyError
+    _OPTIONAL_ARG_KEYS = frozenset(('hair_cache_template',))
+
+    # 拓扑顺序和后续步骤在类定义时计算一次
+    _STEP_ORDER = _topological_order(_STEP_DEPS)
+    _STEP_SUCCESSORS = _step_successors(_STEP_DEPS)
+
     def __init__(self):
-        # 初始化所有管理器
-        self.lookdev_manager = LookdevManager()
-        self.animation_manager = AnimationManager()
-        self.abc_importer = ABCImporter()
-        self.scene_manager = SceneManager()
-        self.material_manager = MaterialManager()
-        self.xgen_manager = XGenManager()
-
-        # 状态跟踪
-        self.assembly_status = {
-            'lookdev_imported': False,
-            'animation_connected': False,
-            'camera_imported': False,
-            'hair_configured': False,
-            'materials_fixed': False,
-            'scene_configured': False
-        }
+        # 管理器在首次使用时才创建（见下方属性）
+        self._lookdev_manager = None
+        self._animation_manager = None
+        self._abc_importer = None
+        self._scene_manager = None
+        self._material_manager = None
+        self._xgen_manager = None
+
+        # 状态跟踪：各步骤完成情况记录为_Status位
+        self._status = 0
 
         # 执行配置
         self.current_asset = None
@@ -40,6 +146,59 @@ class AssemblyCoordinator:
         self.current_animation_files = []
         self.current_camera_file = None
 
+        # 各管理器统计信息缓存 {键: (时间戳, 结果)}，场景被修改时清空
+        self._stats_cache = {}
+
+    # ===== 管理器（延迟导入和创建） =====
+
+    @property
+    def lookdev_manager(self):
+        """Lookdev管理器"""
+        if self._lookdev_manager is None:
+            from managers.lookdev_manager import LookdevManager
+            self._lookdev_manager = LookdevManager()
+        return self._lookdev_manager
+
+    @property
+    def animation_manager(self):
+        """动画管理器"""
+        if self._animation_manager is None:
+            from managers.animation_manager import AnimationManager
+            self._animation_manager = AnimationManager()
+        return self._animation_manager
+
+    @property
+    def abc_importer(self):
+        """ABC导入器"""
+        if self._abc_importer is None:
+            from managers.abc_importer import ABCImporter
+            self._abc_importer = ABCImporter()
+        return self._abc_importer
+
+    @property
+    def scene_manager(self):
+        """场景管理器"""
+        if self._scene_manager is None:
+            from managers.scene_manager import SceneManager
+            self._scene_manager = SceneManager()
+        return self._scene_manager
+
+    @property
+    def material_manager(self):
+        """材质管理器"""
+        if self._material_manager is None:
+            from managers.material_manager import MaterialManager
+            self._material_manager = MaterialManager()
+        return self._material_manager
+
+    @property
+    def xgen_manager(self):
+        """XGen管理器（xgenm导入较慢，只在需要时加载）"""
+        if self._xgen_manager is None:
+            from managers.xgen_manager import XGenManager
+            self._xgen_manager = XGenManager()
+        return self._xgen_manager
+
     def step1_import_lookdev(self, lookdev_file, namespace):
         """
         步骤1: 导入Lookdev文件
@@ -49,14 +208,15 @@ class AssemblyCoordinator:
             namespace (str): 命名空间
             
         Returns:
-            bool: 是否成功
+            tuple: (success, updates)，updates为需要合并到执行配置的字典
         """
         print("\n=== 步骤1: 导入Lookdev文件 ===")
+        self._invalidate_stats_cache()
 
         success = self.lookdev_manager.import_lookdev_file(lookdev_file, namespace)
 
         if success:
-            self.assembly_status['lookdev_imported'] = True
+            self._status |= _Status.LOOKDEV
             self.current_lookdev_file = lookdev_file
 
             # 验证导入结果
@@ -66,7 +226,7 @@ class AssemblyCoordinator:
                 for warning in validation['warnings']:
                     print(f"  - {warning}")
 
-        return success
+        return success, {}
 
     def step2_import_and_connect_animations(self, animation_files, lookdev_namespace, animation_namespace, sequence, shot):
         """
@@ -80,23 +240,23 @@ class AssemblyCoordinator:
             shot
 
         Returns:
-            bool: 是否成功
+            tuple: (success, updates)，updates为需要合并到执行配置的字典
         """
         print("\n=== 步骤2: 导入动画文件并连接 ===")
+        self._invalidate_stats_cache()
 
-        if not self.assembly_status['lookdev_imported']:
+        if not self._status & _Status.LOOKDEV:
             print("❌ 请先导入Lookdev文件")
-            return False
+            return False, {}
 
         # 分离毛发、布料和其他动画文件
         self.animation_manager.find_fur_and_cloth_files(animation_files, sequence, shot, lookdev_namespace)
 
-        # 获取非毛发布料的动画文件
-        regular_animation_files = []
-        for file_path in animation_files:
-            if (file_path not in self.animation_manager.fur_files and
-                    file_path not in self.animation_manager.cloth_files):
-                regular_animation_files.append(file_path)
+        # 获取非毛发布料的动画文件（集合查找，避免逐个在列表中搜索）
+        excluded_files = set(self.animation_manager.fur_files)
+        excluded_files.update(self.animation_manager.cloth_files)
+        regular_animation_files = [file_path for file_path in animation_files
+                                   if file_path not in excluded_files]
 
         success_count = 0
 
@@ -122,12 +282,12 @@ class AssemblyCoordinator:
             print("✅ 特殊组BlendShape处理完成")
 
         if success_count > 0:
-            self.assembly_status['animation_connected'] = True
+            self._status |= _Status.ANIM
             print("✅ 动画文件导入并连接成功")
-            return True
+            return True, {}
         else:
             print("❌ 动画文件导入失败")
-            return False
+            return False, {}
 
     def step3_import_camera(self, camera_file):
         """
@@ -137,18 +297,19 @@ class AssemblyCoordinator:
             camera_file (str): 相机文件路径
             
         Returns:
-            tuple: (success, start_frame, end_frame)
+            tuple: (success, updates)，成功时updates包含start_frame/end_frame
         """
         print("\n=== 步骤3: 导入相机 ===")
+        self._invalidate_stats_cache()
 
         success, start_frame, end_frame, abc_node = self.abc_importer.import_camera_abc(camera_file)
 
         if success:
-            self.assembly_status['camera_imported'] = True
+            self._status |= _Status.CAM
             self.current_camera_file = camera_file
-            return True, start_frame, end_frame
+            return True, {'start_frame': start_frame, 'end_frame': end_frame}
         else:
-            return False, None, None
+            return False, {}
 
     def step4_setup_hair_cache(self, hair_cache_template, sequence, shot, namespaces):
         """
@@ -160,35 +321,35 @@ class AssemblyCoordinator:
             shot (str): 镜头
             namespaces: namese
         Returns:
-            bool: 是否成功
+            tuple: (success, updates)，updates为需要合并到执行配置的字典
         """
         print("\n=== 步骤4: 设置毛发缓存 ===")
+        self._invalidate_stats_cache()
 
-        a = hair_cache_template.format(sequence=sequence, shot=shot, lookdev_namespace=namespaces.replace("_lookdev", ''))
-        print(a)
-        results = self.xgen_manager.setup_hair_cache(a)
-        print(results)
+        hair_cache_path = _resolve_hair_cache_path(hair_cache_template, sequence, shot, namespaces)
+        results = self.xgen_manager.setup_hair_cache(hair_cache_path)
         success = results['updated_descriptions'] > 0 or results['total_palettes'] == 0
         if success:
-            self.assembly_status['hair_configured'] = True
+            self._status |= _Status.HAIR
 
-        return success
+        return success, {}
 
     def step5_fix_materials(self):
         """
         步骤5: 修复材质
         
         Returns:
-            bool: 是否成功
+            tuple: (success, updates)，updates为需要合并到执行配置的字典
         """
         print("\n=== 步骤5: 修复材质 ===")
+        self._invalidate_stats_cache()
 
         results = self.material_manager.check_and_fix_materials()
 
-        self.assembly_status['materials_fixed'] = True
+        self._status |= _Status.MAT
         print(f"✅ 材质修复完成: {results['fixed_textures']} 个纹理已修复")
 
-        return True
+        return True, {}
 
     def step6_setup_scene(self, start_frame, end_frame, lookdev_namespace):
         """
@@ -200,14 +361,15 @@ class AssemblyCoordinator:
             lookdev_namespace (str): Lookdev命名空间
             
         Returns:
-            bool: 是否成功
+            tuple: (success, updates)，updates为需要合并到执行配置的字典
         """
         print("\n=== 步骤6: 设置场景参数 ===")
+        self._invalidate_stats_cache()
 
         # 优化场景
         self.scene_manager.optimize_scene(lookdev_namespace)
-        self.assembly_status['scene_configured'] = True
-        return True
+        self._status |= _Status.SCENE
+        return True, {}
 
     def execute_all_steps(self, config):
         """
@@ -223,131 +385,178 @@ class AssemblyCoordinator:
         print("开始执行所有步骤")
         print("=" * 50)
 
-        steps = [
-            (self.step1_import_lookdev, [config['lookdev_file'], config['lookdev_namespace']]),
-            (self.step2_import_and_connect_animations, [
-                config['animation_files'],
-                config['lookdev_namespace'],
-                config['animation_namespace'],
-                config['sequence'],
-                config['shot']
-            ]),
-            (self.step3_import_camera, [config['camera_file']]),
-            (self.step4_setup_hair_cache, [
-                config.get('hair_cache_template'),
-                config['sequence'],
-                config['shot']
-            ]),
-            (self.step5_fix_materials, []),
-            (self.step6_setup_scene, [
-                config['start_frame'],
-                config['end_frame'],
-                config['lookdev_namespace']
-            ])
-        ]
+        # 必需的配置键缺失时在执行任何步骤前抛出KeyError
+        for arg_keys in self._STEP_ARG_KEYS.values():
+            for key in arg_keys:
+                if key not in config and key not in self._OPTIONAL_ARG_KEYS:
+                    raise KeyError(key)
 
         success_count = 0
-
-        for i, (step_func, args) in enumerate(steps, 1):
+        skipped = set()
+
+        # Maya命令只能在主线程修改场景，按依赖的拓扑顺序依次执行
+        for i, step_name in enumerate(self._STEP_ORDER, 1):
+            # 前置步骤失败时直接跳过，不再执行注定失败的步骤
+            if step_name in skipped:
+                print(f"\n⏭ 跳过步骤 {i}（前置步骤未完成）")
+                continue
+
+            step_func = getattr(self, step_name)
+            # 参数在调度时从配置中取，前面步骤合并的updates（如相机帧范围）可以生效
+            args = [config.get(key) if key in self._OPTIONAL_ARG_KEYS else config[key]
+                    for key in self._STEP_ARG_KEYS[step_name]]
             try:
                 print(f"\n执行步骤 {i}...")
 
-                if step_func == self.step3_import_camera:
-                    # 相机步骤返回不同的格式
-                    success, start_frame, end_frame = step_func(*args)
-                    if success and start_frame is not None:
-                        config['start_frame'] = start_frame
-                        config['end_frame'] = end_frame
-                else:
-                    success = step_func(*args)
+                # 所有步骤统一返回 (success, updates)
+                success, updates = step_func(*args)
+                config.update(updates)
 
                 if success:
                     success_count += 1
                     print(f"✅ 步骤 {i} 完成")
-                else:
-                    print(f"❌ 步骤 {i} 失败")
+                    continue
+
+                print(f"❌ 步骤 {i} 失败")
 
             except Exception as e:
                 print(f"❌ 步骤 {i} 执行出错: {str(e)}")
 
-        overall_success = success_count == len(steps)
+            self._skip_successors(step_name, skipped)
+
+        # 所有导入完成后统一设置一次时间轴，不受其他步骤失败或跳过的影响
+        if self._status & _Status.CAM:
+            self.abc_importer.apply_time_range()
+
+        overall_success = success_count == len(self._STEP_ORDER)
 
         if overall_success:
             print("\n🎉 所有步骤执行完成！")
         else:
-            print(f"\n⚠️  执行完成，成功率: {success_count}/{len(steps)}")
+            print(f"\n⚠️  执行完成，成功率: {success_count}/{len(self._STEP_ORDER)}")
+            if skipped:
+                print(f"⏭ 因前置步骤失败跳过 {len(skipped)} 个步骤")
 
         return overall_success
 
+    def _skip_successors(self, step_name, skipped):
+        """
+        将失败步骤的所有后续步骤加入跳过集合
+        
+        Args:
+            step_name (str): 失败的步骤名
+            skipped (set): 跳过的步骤集合（原地更新）
+        """
+        pending = list(self._STEP_SUCCESSORS[step_name])
+        while pending:
+            successor = pending.pop()
+            if successor not in skipped:
+                skipped.add(successor)
+                pending.extend(self._STEP_SUCCESSORS[successor])
+
+    def _cached_stats(self, key, stats_func, ttl=2.0):
+        """
+        获取缓存的统计信息，超过有效期后重新统计
+        
+        Args:
+            key (str): 缓存键
+            stats_func (callable): 统计函数
+            ttl (float): 有效期（秒）
+            
+        Returns:
+            统计函数的结果
+        """
+        now = time.monotonic()
+        cached = self._stats_cache.get(key)
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+
+        value = stats_func()
+        self._stats_cache[key] = (now, value)
+        return value
+
+    def _invalidate_stats_cache(self):
+        """清空统计信息缓存（场景被修改后调用）"""
+        self._stats_cache.clear()
+
+    @property
+    def assembly_status(self):
+        """组装状态字典（由状态位即时生成）"""
+        status = self._status
+        return {step: bool(status & bit) for step, bit in _STATUS_KEYS}
+
     def get_assembly_status(self):
         """获取组装状态"""
-        return self.assembly_status.copy()
+        return self.assembly_status
 
     def get_assembly_summary(self):
         """获取组装摘要"""
         summary = {
-            'status': self.assembly_status.copy(),
-            'lookdev_info': self.lookdev_manager.get_lookdev_statistics(),
-            'animation_info': self.animation_manager.get_animation_statistics(),
-            'scene_info': self.scene_manager.get_scene_info(),
-            'material_info': self.material_manager.get_material_statistics(),
-            'xgen_info': self.xgen_manager.get_xgen_statistics()
+            'status': self.assembly_status,
+            'lookdev_info': self._cached_stats('lookdev', self.lookdev_manager.get_lookdev_statistics),
+            'animation_info': self._cached_stats('animation', self.animation_manager.get_animation_statistics),
+            'scene_info': self._cached_stats('scene', self.scene_manager.get_scene_info),
+            'material_info': self._cached_stats('material', self.material_manager.get_material_statistics),
+            'xgen_info': self._cached_stats('xgen', self.xgen_manager.get_xgen_statistics)
         }
         return summary
 
-    def print_assembly_summary(self):
-        """打印组装摘要"""
-        print("\n" + "=" * 50)
-        print("组装摘要")
-        print("=" * 50)
+    def print_assembly_summary(self, summary=None):
+        """
+        打印组装摘要
+        
+        Args:
+            summary (dict): get_assembly_summary()的结果，为None时重新获取
+        """
+        summary = summary or self.get_assembly_summary()
+
+        lines = ["\n" + "=" * 50, "组装摘要", "=" * 50]
 
-        # 打印状态
-        print("执行状态:")
-        for step, status in self.assembly_status.items():
-            status_icon = "✅" if status else "❌"
-            print(f"  {step}: {status_icon}")
+        # 执行状态
+        lines.append("执行状态:")
+        lines.extend(f"  {step}: {_STATUS_ICON[bool(status)]}" for step, status in summary['status'].items())
 
-        # 打印各模块信息
-        print("\n模块统计:")
+        # 各模块信息
+        lines.append("\n模块统计:")
 
         # Lookdev信息
-        lookdev_stats = self.lookdev_manager.get_lookdev_statistics()
-        print(f"  Lookdev: {lookdev_stats['mesh_count']} 个几何体, {lookdev_stats['material_count']} 个材质")
+        lookdev_stats = summary['lookdev_info']
+        lines.append(f"  Lookdev: {lookdev_stats['mesh_count']} 个几何体, {lookdev_stats['material_count']} 个材质")
 
         # 动画信息
-        animation_stats = self.animation_manager.get_animation_statistics()
-        print(
+        animation_stats = summary['animation_info']
+        lines.append(
             f"  动画: {animation_stats['total_animation_files']} 个文件, {animation_stats['blendshape_count']} 个BlendShape")
 
         # 场景信息
-        scene_stats = self.scene_manager.get_scene_info()
+        scene_stats = summary['scene_info']
         if scene_stats:
-            print(
+            lines.append(
                 f"  场景: {scene_stats.get('mesh_count', 0)} 个几何体, {scene_stats.get('abc_nodes_count', 0)} 个ABC节点")
 
         # 材质信息
-        material_stats = self.material_manager.get_material_statistics()
-        print(f"  材质: {material_stats['total_materials']} 个材质, {material_stats['missing_textures']} 个缺失纹理")
+        material_stats = summary['material_info']
+        lines.append(f"  材质: {material_stats['total_materials']} 个材质, {material_stats['missing_textures']} 个缺失纹理")
 
         # XGen信息
-        xgen_stats = self.xgen_manager.get_xgen_statistics()
-        print(f"  XGen: {xgen_stats['palette_count']} 个调色板, {xgen_stats['description_count']} 个描述")
+        xgen_stats = summary['xgen_info']
+        lines.append(f"  XGen: {xgen_stats['palette_count']} 个调色板, {xgen_stats['description_count']} 个描述")
+
+        # 一次输出，避免Maya脚本编辑器逐行刷新
+        print("\n".join(lines))
 
     def reset_assembly_status(self):
         """重置组装状态"""
-        self.assembly_status = {
-            'lookdev_imported': False,
-            'animation_connected': False,
-            'camera_imported': False,
-            'hair_configured': False,
-            'materials_fixed': False,
-            'scene_configured': False
-        }
+        self._status = 0
 
-        # 清理各管理器
-        self.lookdev_manager.cleanup_lookdev()
-        self.animation_manager.cleanup_animation()
-        self.abc_importer.clear_imported_nodes()
+        # 清理各管理器（未创建的管理器没有需要清理的内容）
+        if self._lookdev_manager is not None:
+            self._lookdev_manager.cleanup_lookdev()
+        if self._animation_manager is not None:
+            self._animation_manager.cleanup_animation()
+        if self._abc_importer is not None:
+            self._abc_importer.clear_imported_nodes()
+        self._invalidate_stats_cache()
 
         print("✅ 组装状态已重置")
 
@@ -376,7 +585,7 @@ class AssemblyCoordinator:
         }
 
         # 验证Lookdev
-        if self.assembly_status['lookdev_imported']:
+        if self._status & _Status.LOOKDEV:
             lookdev_validation = self.lookdev_manager.validate_lookdev()
             if not lookdev_validation['valid']:
                 validation['errors'].extend(lookdev_validation['errors'])
@@ -385,10 +594,11 @@ class AssemblyCoordinator:
             validation['errors'].append("Lookdev未导入")
 
         # 验证其他状态
-        critical_steps = ['animation_connected', 'camera_imported']
-        for step in critical_steps:
-            if not self.assembly_status[step]:
-                validation['warnings'].append(f"步骤未完成: {step}")
+        missing = _REQUIRED_MASK & ~self._status
+        if missing:
+            for step, bit in _STATUS_KEYS:
+                if missing & bit:
+                    validation['warnings'].append(f"步骤未完成: {step}")
 
         validation['valid'] = len(validation['errors']) == 0
 
@@ -216,7 +216,8 @@ class CoreAssembler:
             print("❌ 没有可用的Lookdev文件")
             return False
         
-        return self.coordinator.step1_import_lookdev(self.current_lookdev_file, self.lookdev_namespace)
+        success, _ = self.coordinator.step1_import_lookdev(self.current_lookdev_file, self.lookdev_namespace)
+        return success
     
     def step2_import_and_connect_animation_abc(self):
         """步骤2: 导入动画ABC并连接"""
@@ -224,13 +225,14 @@ class CoreAssembler:
             print("❌ 没有可用的动画文件")
             return False
         
-        return self.coordinator.step2_import_and_connect_animations(
+        success, _ = self.coordinator.step2_import_and_connect_animations(
             self.current_animation_files,
             self.lookdev_namespace,
             self.animation_namespace,
             self.sequence,
             self.shot
         )
+        return success
     
     def step3_import_camera_abc(self):
         """步骤3: 导入动画相机ABC"""
@@ -238,26 +240,33 @@ class CoreAssembler:
             print("❌ 没有可用的相机文件")
             return False
         
-        success, start_frame, end_frame = self.coordinator.step3_import_camera(self.current_camera_file)
+        success, updates = self.coordinator.step3_import_camera(self.current_camera_file)
         
-        if success and start_frame is not None:
-            self.start_frame = start_frame
-            self.end_frame = end_frame
+        if success and updates.get('start_frame') is not None:
+            self.start_frame = updates['start_frame']
+            self.end_frame = updates['end_frame']
+        
+        # 单独执行相机导入时立即设置时间轴（一键执行时由协调器在最后统一设置）
+        if success:
+            self.coordinator.abc_importer.apply_time_range()
         
         return success
     
     def step4_setup_hair_cache(self):
         """步骤4: 设置毛发缓存路径"""
         hair_template = self.config_manager.base_paths.get('hair_cache_template')
-        return self.coordinator.step4_setup_hair_cache(hair_template, self.sequence, self.shot, self.lookdev_namespace)
+        success, _ = self.coordinator.step4_setup_hair_cache(hair_template, self.sequence, self.shot, self.lookdev_namespace)
+        return success
     
     def step5_fix_materials(self):
         """步骤5: 检查修复材质"""
-        return self.coordinator.step5_fix_materials()
+        success, _ = self.coordinator.step5_fix_materials()
+        return success
     
     def step6_setup_scene(self):
         """步骤6: 设置场景参数"""
-        return self.coordinator.step6_setup_scene(self.start_frame, self.end_frame, self.lookdev_namespace)
+        success, _ = self.coordinator.step6_setup_scene(self.start_frame, self.end_frame, self.lookdev_namespace)
+        return success
     
     def execute_all_steps(self):
         """一键执行所有步骤"""
@@ -3,20 +3,61 @@ ABC导入管理模块
 负责处理所有ABC文件导入和连接功能
 """
 
+from contextlib import contextmanager
+from functools import lru_cache
+
+import maya.api.OpenMaya as om2
 import maya.cmds as cmds
 import maya.mel as mel
 import os
 import re
 from .blendshape_manager import BlendshapeManager
 
+# 名称处理用的正则（模块加载时编译一次）
+_PREFIX_RE = re.compile(r'^(chr_|prop_|env_|set_)')
+_SUFFIX_RE = re.compile(r'(_shape|_mesh|_geo)$')
+_SPLIT_RE = re.compile(r'[_\-\s]+')
+# mesh名称尾部的Shape和数字后缀（等价于先去掉_数字，再去掉Shape）
+_MESH_SUFFIX_RE = re.compile(r'(?:Shape)?(?:_\d+)?$')
+_AFFIX_RE = re.compile(r'(chr_|dwl_|_grp|grp)')
+_TRAILING_NUM_RE = re.compile(r'_?\d+$')
+
+# 特殊mesh配对关键词，每个关键词对应一个bit
+_SPECIAL_KEYS = ('body', 'face', 'hair', 'cloth', 'eye', 'teeth', 'tongue')
+_SPECIAL_BIT = {key: 1 << i for i, key in enumerate(_SPECIAL_KEYS)}
+# 零宽前瞻的关键词交替式：一次扫描找出所有关键词（包括相互重叠的，如 faceye）
+_SPECIAL_RE = re.compile('(?=(%s))' % '|'.join(_SPECIAL_KEYS))
+
+
+@lru_cache(maxsize=4096)
+def _clean_mesh_name(transform_name):
+    """清理mesh名称：去除路径、命名空间、数字后缀和Shape后缀（同一节点会被多次清理，结果缓存）"""
+    name = transform_name.rpartition('|')[2].rpartition(':')[2]
+    return _MESH_SUFFIX_RE.sub('', name, count=1)
+
+
+@lru_cache(maxsize=4096)
+def _special_bits(name):
+    """计算名称包含的特殊关键词bit掩码"""
+    bits = 0
+    for match in _SPECIAL_RE.finditer(name):
+        bits |= _SPECIAL_BIT[match.group(1)]
+    return bits
+
+
 class ABCImporter:
     """ABC导入管理器"""
     
-    def __init__(self):
-        self.blendshape_manager = BlendshapeManager()
+    def __init__(self, verbose=False):
+        self.blendshape_manager = BlendshapeManager(verbose=verbose)
         self.imported_abc_nodes = []
         self.pending_abc_files = []  # 待连接的ABC文件
         self.time_range = [1, 100]  # 默认时间范围
+        self.verbose = verbose  # 是否输出逐个mesh的详细信息
+        self._log_buf = []  # 延迟输出的日志缓冲
+        self._pending_weights = []  # 待统一设置的blendShape权重 [(节点, 索引, 权重)]
+        self._pending_targets = {}  # 待批量添加的blendShape目标 {节点: [(ABC transform, Lookdev transform, ABC名称)]}
+        self._blendshape_cache = {}  # 本次连接中mesh shape -> blendShape节点的查询结果
     
     def import_single_animation_abc(self, animation_file, namespace=None):
         """
@@ -174,15 +215,16 @@ class ABCImporter:
         """查找最佳匹配的lookdev名称"""
         abc_clean = self._clean_name(abc_name)
         
+        # 每个lookdev名称只清理一次，两轮匹配共用
+        cleaned_names = [(lookdev_name, self._clean_name(lookdev_name)) for lookdev_name in lookdev_names]
+        
         # 直接匹配
-        for lookdev_name in lookdev_names:
-            lookdev_clean = self._clean_name(lookdev_name)
+        for lookdev_name, lookdev_clean in cleaned_names:
             if abc_clean == lookdev_clean:
                 return lookdev_name
         
         # 部分匹配
-        for lookdev_name in lookdev_names:
-            lookdev_clean = self._clean_name(lookdev_name)
+        for lookdev_name, lookdev_clean in cleaned_names:
             if abc_clean in lookdev_clean or lookdev_clean in abc_clean:
                 return lookdev_name
         
@@ -190,11 +232,10 @@ class ABCImporter:
     
     def _clean_name(self, name):
         """清理名称用于匹配"""
-        import re
         name = name.lower()
         # 移除常见前缀后缀和数字
-        name = re.sub(r'(chr_|dwl_|_grp|grp)', '', name)
-        name = re.sub(r'_?\d+$', '', name)
+        name = _AFFIX_RE.sub('', name)
+        name = _TRAILING_NUM_RE.sub('', name)
         return name
     
     def _set_active_camera(self, camera_transform):
@@ -267,18 +308,18 @@ class ABCImporter:
         try:
             print(f"导入相机ABC: {os.path.basename(camera_file)}")
 
+            # 只扫描一次场景中的ABC节点，供重复检查和导入前后对比共用
+            abc_nodes_before = cmds.ls(type="AlembicNode") or []
+
             # 检查是否已经导入了相同的相机文件
-            if self._is_camera_already_imported(camera_file):
+            if self._is_camera_already_imported(camera_file, abc_nodes_before):
                 print("✅ 相机已存在，跳过重复导入")
-                # 获取已存在相机的时间范围信息
-                abc_nodes = cmds.ls(type="AlembicNode")
-                if abc_nodes:
-                    abc_node = abc_nodes[-1]
-                    start_frame = cmds.getAttr(f"{abc_node}.startFrame")
-                    end_frame = cmds.getAttr(f"{abc_node}.endFrame")
-                    return True, start_frame, end_frame, abc_node
-                else:
-                    return True, 1001, 1100, None
+                # 获取已存在相机的时间范围信息，读取失败时使用默认范围，避免沿用上一个镜头的范围
+                abc_node = abc_nodes_before[-1] if abc_nodes_before else None
+                if not self._update_time_range_from_abc(abc_node):
+                    self.time_range = [1001, 1100]
+                start_frame, end_frame = self.time_range
+                return True, start_frame, end_frame, abc_node
 
             # 标准化路径分隔符
             camera_file = camera_file.replace('\\', '/')
@@ -297,9 +338,8 @@ class ABCImporter:
             if not cmds.pluginInfo('AbcImport', query=True, loaded=True):
                 cmds.loadPlugin('AbcImport')
 
-            # 记录导入前的相机和ABC节点
-            cameras_before = set(cmds.ls(type="camera"))
-            abc_nodes_before = set(cmds.ls(type="AlembicNode"))
+            # 导入前的ABC节点（新相机从新ABC节点的连接推导，无需扫描场景相机）
+            abc_nodes_before = set(abc_nodes_before)
 
             # 导入ABC文件 - 使用用户提供的标准方式
             print(f"正在导入相机文件: {camera_file}")
@@ -307,34 +347,36 @@ class ABCImporter:
             # 确保路径格式正确 - 使用正斜杠
             maya_path = camera_file.replace('\\', '/')
 
-            try:
-                cmds.file(
-                    maya_path,
-                    i=True,  # import
-                    type="Alembic",  # 文件类型
-                    ignoreVersion=True,  # 忽略版本
-                    ra=True,  # reference as
-                    mergeNamespacesOnClash=False,  # 不合并命名空间冲突
-                    pr=True,  # preserve references
-                    importTimeRange="combine"  # 导入时间范围
-                )
-                print("✅ 使用标准file命令导入ABC成功")
-
-            except Exception as file_error:
-                print(f"❌ file命令导入失败: {str(file_error)}")
-                # 备用方案：尝试cmds.AbcImport
+            # 导入期间暂停求值和视图刷新，时间范围在导入后统一设置
+            with self._suspend_evaluation():
                 try:
-                    cmds.AbcImport(maya_path, mode="import", fitTimeRange=True)
-                    print("✅ 使用AbcImport导入成功")
-                except Exception as abc_error:
-                    print(f"❌ AbcImport也失败: {str(abc_error)}")
-                    # 最后尝试MEL方式
+                    cmds.file(
+                        maya_path,
+                        i=True,  # import
+                        type="Alembic",  # 文件类型
+                        ignoreVersion=True,  # 忽略版本
+                        ra=True,  # reference as
+                        mergeNamespacesOnClash=False,  # 不合并命名空间冲突
+                        pr=True,  # preserve references
+                        importTimeRange="combine"  # 导入时间范围
+                    )
+                    print("✅ 使用标准file命令导入ABC成功")
+
+                except Exception as file_error:
+                    print(f"❌ file命令导入失败: {str(file_error)}")
+                    # 备用方案：尝试cmds.AbcImport
                     try:
-                        mel.eval(f'AbcImport -mode import "{maya_path}"')
-                        print("✅ 使用MEL方式导入成功")
-                    except Exception as mel_error:
-                        print(f"❌ 所有导入方式都失败: {str(mel_error)}")
-                        return False, None, None, None
+                        cmds.AbcImport(maya_path, mode="import", fitTimeRange=False)
+                        print("✅ 使用AbcImport导入成功")
+                    except Exception as abc_error:
+                        print(f"❌ AbcImport也失败: {str(abc_error)}")
+                        # 最后尝试MEL方式
+                        try:
+                            mel.eval(f'AbcImport -mode import "{maya_path}"')
+                            print("✅ 使用MEL方式导入成功")
+                        except Exception as mel_error:
+                            print(f"❌ 所有导入方式都失败: {str(mel_error)}")
+                            return False, None, None, None
 
             # 查找新导入的ABC节点
             abc_nodes_after = set(cmds.ls(type="AlembicNode"))
@@ -343,35 +385,19 @@ class ABCImporter:
             if new_abc_nodes:
                 abc_node = list(new_abc_nodes)[0]
 
-                # 获取时间范围
-                start_frame = cmds.getAttr(f"{abc_node}.startFrame")
-                end_frame = cmds.getAttr(f"{abc_node}.endFrame")
-
-                # 设置Maya场景的时间范围
-                current_start = cmds.playbackOptions(query=True, minTime=True)
-                current_end = cmds.playbackOptions(query=True, maxTime=True)
-
-                print(f"当前场景帧范围: {current_start} - {current_end}")
+                # 直接从新ABC节点获取时间范围，只记录到self.time_range，
+                # 场景时间轴由组装结束时的apply_time_range()统一设置；读取失败时使用默认范围
+                if not self._update_time_range_from_abc(abc_node):
+                    self.time_range = [1001, 1100]
+                start_frame, end_frame = self.time_range
                 print(f"ABC文件帧范围: {start_frame} - {end_frame}")
 
-                # 设置场景的时间范围为ABC的时间范围
-                cmds.playbackOptions(minTime=start_frame, maxTime=end_frame)
-
-                # 同时设置动画范围（时间轴的开始和结束）
-                cmds.playbackOptions(animationStartTime=start_frame, animationEndTime=end_frame)
-
-                # 设置当前帧为开始帧
-                cmds.currentTime(start_frame+10)
-
-                print(f"✅ 场景时间范围已设置为: {start_frame} - {end_frame}")
-
-                # 查找新导入的相机
-                cameras_after = set(cmds.ls(type="camera"))
-                new_cameras = cameras_after - cameras_before
+                # 查找新导入的相机（只在ABC节点驱动的transform中查找）
+                abc_transforms = self._get_abc_driven_transforms([abc_node])
+                new_cameras = cmds.listRelatives(abc_transforms, shapes=True, type="camera", fullPath=True) if abc_transforms else None
 
                 if new_cameras:
-                    camera_shape = list(new_cameras)[0]
-                    camera_transform = cmds.listRelatives(camera_shape, parent=True, type="transform")[0]
+                    camera_transform = new_cameras[0].rpartition('|')[0]
                     print(f"✅ 成功导入相机: {camera_transform}")
 
                     # 设置为当前视图相机
@@ -387,8 +413,14 @@ class ABCImporter:
             print(f"❌ 导入相机ABC失败: {str(e)}")
             return False, None, None, None
     
-    def _is_camera_already_imported(self, camera_file):
-        """检查相机是否已经导入"""
+    def _is_camera_already_imported(self, camera_file, abc_nodes=None):
+        """
+        检查相机是否已经导入
+        
+        Args:
+            camera_file (str): 相机文件路径
+            abc_nodes (list): 调用方已获取的场景ABC节点列表，为None时重新查询
+        """
         try:
             # 检查是否有相机存在
             cameras = cmds.ls(type="camera")
@@ -396,7 +428,8 @@ class ABCImporter:
                 return False
             
             # 检查ABC节点数量（简单判断）
-            abc_nodes = cmds.ls(type="AlembicNode")
+            if abc_nodes is None:
+                abc_nodes = cmds.ls(type="AlembicNode")
             
             # 如果有多个ABC节点，可能已经导入了相机
             if len(abc_nodes) > 0:
@@ -409,13 +442,17 @@ class ABCImporter:
                             # 比较文件路径（标准化后）
                             if abc_file_path and os.path.normpath(abc_file_path) == os.path.normpath(camera_file):
                                 return True
-                    except:
+                    except RuntimeError:
                         continue
             
             # 如果有相机但没有找到匹配的ABC文件路径，做简单判断
             # 非默认相机数量大于3个时，可能已导入相机
             default_cameras = ['persp', 'top', 'front', 'side']
-            non_default_cameras = [cam for cam in cameras if cmds.listRelatives(cam, parent=True)[0] not in default_cameras]
+            non_default_cameras = []
+            for cam in cameras:
+                parents = cmds.listRelatives(cam, parent=True)
+                if parents and parents[0] not in default_cameras:
+                    non_default_cameras.append(cam)
             
             return len(non_default_cameras) > 0 and len(abc_nodes) > 0
             
@@ -426,40 +463,37 @@ class ABCImporter:
     def _import_abc_file(self, animation_file, namespace):
         """导入ABC文件"""
         try:
-            # 记录导入前的对象
-            objects_before = set(cmds.ls(assemblies=True))
-            
             # 设置导入命名空间
             import_namespace = namespace or "animation"
             
             # 导入ABC文件 - 使用用户提供的标准方式
             maya_path = animation_file.replace('\\', '/')
             
-            try:
-                # 参考用户提供的标准ABC导入方式
-                cmds.file(
-                    maya_path,
-                    i=True,                          # import
-                    type="Alembic",                  # 文件类型
-                    ignoreVersion=True,              # 忽略版本
-                    ra=True,                         # reference as
-                    mergeNamespacesOnClash=False,    # 不合并命名空间冲突
-                    namespace=import_namespace,      # 命名空间
-                    pr=True,                         # preserve references
-                    importTimeRange="combine"        # 导入时间范围
-                )
-            except Exception as file_error:
-                print(f"❌ file命令导入失败: {str(file_error)}")
-                # 备用方案：使用原来的方法
-                cmds.AbcImport(maya_path, mode="import", fitTimeRange=True)
-            
-            # 查找新导入的对象
-            objects_after = set(cmds.ls(assemblies=True))
-            new_transforms = list(objects_after - objects_before)
+            # 导入期间暂停求值和视图刷新，避免逐节点的脏传播；
+            # 同时通过节点创建回调记录新节点，无需对场景做前后快照
+            with self._suspend_evaluation(), self._track_added_nodes('transform', 'AlembicNode') as added_nodes:
+                try:
+                    # 参考用户提供的标准ABC导入方式
+                    cmds.file(
+                        maya_path,
+                        i=True,                          # import
+                        type="Alembic",                  # 文件类型
+                        ignoreVersion=True,              # 忽略版本
+                        ra=True,                         # reference as
+                        mergeNamespacesOnClash=False,    # 不合并命名空间冲突
+                        namespace=import_namespace,      # 命名空间
+                        pr=True,                         # preserve references
+                        importTimeRange="combine"        # 导入时间范围
+                    )
+                except Exception as file_error:
+                    print(f"❌ file命令导入失败: {str(file_error)}")
+                    # 备用方案：使用原来的方法
+                    cmds.AbcImport(maya_path, mode="import", fitTimeRange=True)
             
-            # 查找ABC节点
-            abc_nodes = cmds.ls(type="AlembicNode")
-            abc_node = abc_nodes[-1] if abc_nodes else None
+            # 与_import_ma_file一致，只返回新导入的顶层对象
+            new_transforms = [node for node in self._get_node_names(added_nodes['transform']) if node.count('|') == 1]
+            new_abc_nodes = self._get_node_names(added_nodes['AlembicNode'])
+            abc_node = new_abc_nodes[0] if new_abc_nodes else None
             
             if abc_node:
                 # 更新时间范围
@@ -481,15 +515,11 @@ class ABCImporter:
     def _import_ma_file(self, ma_file, namespace):
         """导入Maya ASCII文件"""
         try:
-            # 记录导入前的对象
-            objects_before = set(cmds.ls(assemblies=True))
+            # 导入Maya文件，直接返回新建节点，无需对整个场景做前后快照
+            new_nodes = cmds.file(ma_file, i=True, namespace=namespace or "animation", returnNewNodes=True) or []
             
-            # 导入Maya文件
-            cmds.file(ma_file, i=True, namespace=namespace or "animation")
-            
-            # 查找新导入的对象
-            objects_after = set(cmds.ls(assemblies=True))
-            new_transforms = list(objects_after - objects_before)
+            # 只保留新导入的顶层对象
+            new_transforms = [node for node in cmds.ls(new_nodes, type='transform', long=True) if node.count('|') == 1]
             
             print(f"✅ Maya文件导入成功: {len(new_transforms)} 个对象")
             return True, new_transforms, None
@@ -498,29 +528,130 @@ class ABCImporter:
             print(f"❌ Maya文件导入失败: {str(e)}")
             return False, [], None
     
+    @contextmanager
+    def _suspend_evaluation(self):
+        """
+        在导入期间关闭并行求值、暂停视图刷新和撤销记录，退出时恢复原状态
+        """
+        eval_mode = cmds.evaluationManager(query=True, mode=True)[0]
+        undo_state = cmds.undoInfo(query=True, state=True)
+        # 嵌套在其他暂停刷新的代码中时，退出后需保持外层的暂停状态
+        refresh_suspended = cmds.refresh(query=True, suspend=True)
+        
+        try:
+            cmds.evaluationManager(mode='off')
+            cmds.refresh(suspend=True)
+            cmds.undoInfo(stateWithoutFlush=False)
+            yield
+        finally:
+            cmds.undoInfo(stateWithoutFlush=undo_state)
+            cmds.refresh(suspend=refresh_suspended)
+            cmds.evaluationManager(mode=eval_mode)
+    
+    @contextmanager
+    def _track_added_nodes(self, *node_types):
+        """
+        在上下文期间通过节点创建回调记录新建的节点
+        
+        Args:
+            *node_types (str): 需要记录的节点类型
+            
+        Yields:
+            dict: {节点类型: [MObjectHandle]}，退出上下文后可通过_get_node_names转换为名称
+        """
+        added_nodes = {node_type: [] for node_type in node_types}
+        callback_ids = []
+        try:
+            for node_type in node_types:
+                handles = added_nodes[node_type]
+                callback_ids.append(om2.MDGMessage.addNodeAddedCallback(
+                    lambda node, client_data, handles=handles: handles.append(om2.MObjectHandle(node)),
+                    node_type
+                ))
+            yield added_nodes
+        finally:
+            for callback_id in callback_ids:
+                om2.MMessage.removeCallback(callback_id)
+    
+    def _get_node_names(self, handles):
+        """
+        将记录的MObjectHandle转换为节点名称（DAG节点返回全路径），跳过已被删除的节点
+        """
+        names = []
+        for handle in handles:
+            if not handle.isAlive() or not handle.isValid():
+                continue
+            
+            node = handle.object()
+            if node.hasFn(om2.MFn.kDagNode):
+                names.append(om2.MFnDagNode(node).fullPathName())
+            else:
+                names.append(om2.MFnDependencyNode(node).name())
+        return names
+    
+    def _get_abc_driven_transforms(self, abc_nodes):
+        """
+        获取ABC节点驱动的transform
+        
+        Args:
+            abc_nodes (list): ABC节点列表
+            
+        Returns:
+            list: transform全路径列表（shape连接会换算为其父transform）
+        """
+        if not abc_nodes:
+            return []
+        
+        connected = cmds.listConnections(abc_nodes, source=False, destination=True, shapes=True) or []
+        if not connected:
+            return []
+        
+        transforms = cmds.ls(connected, type='transform', long=True) or []
+        shapes = cmds.ls(connected, shapes=True, long=True) or []
+        if shapes:
+            transforms += cmds.listRelatives(shapes, parent=True, fullPath=True) or []
+        
+        # 去重并保持顺序
+        return list(dict.fromkeys(transforms))
+    
     def _update_time_range_from_abc(self, abc_node):
-        """从ABC节点更新时间范围"""
+        """
+        从ABC节点更新时间范围
+        
+        Returns:
+            bool: 是否成功读取，失败时self.time_range保持不变
+        """
         try:
             if abc_node:
-                start_frame = cmds.getAttr(f"{abc_node}.startFrame")
-                end_frame = cmds.getAttr(f"{abc_node}.endFrame")
+                abc_fn = om2.MFnDependencyNode(self._get_dependency_node(abc_node))
+                start_frame = abc_fn.findPlug('startFrame', False).asDouble()
+                end_frame = abc_fn.findPlug('endFrame', False).asDouble()
                 
                 self.time_range = [start_frame, end_frame]
                 print(f"从ABC获取时间范围: {start_frame} - {end_frame}")
+                return True
                 
         except Exception as e:
             print(f"获取ABC时间范围失败: {str(e)}")
+        
+        return False
     
     
-    def _get_time_range_from_imported_camera(self):
-        """从导入的相机获取时间范围"""
+    def _get_time_range_from_imported_camera(self, abc_node=None):
+        """
+        从导入的相机获取时间范围
+        
+        Args:
+            abc_node (str): 相机导入时新建的ABC节点，为None时使用场景中最新的ABC节点
+        """
         try:
-            # 查找ABC节点（相机导入也会创建ABC节点）
-            abc_nodes = cmds.ls(type="AlembicNode")
-            
-            if abc_nodes:
+            if abc_node is None:
+                # 查找ABC节点（相机导入也会创建ABC节点）
+                abc_nodes = cmds.ls(type="AlembicNode")
                 # 使用最新的ABC节点
-                abc_node = abc_nodes[-1]
+                abc_node = abc_nodes[-1] if abc_nodes else None
+            
+            if abc_node:
                 self._update_time_range_from_abc(abc_node)
             else:
                 # 如果没有ABC节点，使用当前时间范围
@@ -575,50 +706,129 @@ class ABCImporter:
             print(f"❌ 连接ABC到Lookdev失败: {str(e)}")
             return False
     
+    def _get_dependency_node(self, node_name):
+        """通过MSelectionList获取节点的MObject"""
+        sel = om2.MSelectionList()
+        sel.add(node_name)
+        return sel.getDependNode(0)
+    
+    def _get_dag_paths(self, node_names):
+        """将节点名称列表一次性解析为MDagPath列表（跳过不存在的节点）"""
+        sel = om2.MSelectionList()
+        for node_name in node_names:
+            try:
+                sel.add(node_name)
+            except RuntimeError:
+                continue
+        
+        dag_paths = []
+        for i in range(sel.length()):
+            try:
+                dag_paths.append(sel.getDagPath(i))
+            except (TypeError, RuntimeError):
+                # 非DAG节点
+                continue
+        return dag_paths
+    
+    def _get_downstream_dag_nodes(self, source_obj):
+        """获取节点输出直接连接到的所有DAG节点（全路径）"""
+        downstream = set()
+        for plug in om2.MFnDependencyNode(source_obj).getConnections():
+            for dest_plug in plug.destinations():
+                dest_node = dest_plug.node()
+                if dest_node.hasFn(om2.MFn.kDagNode):
+                    downstream.add(om2.MFnDagNode(dest_node).fullPathName())
+        return downstream
+    
+    def _log(self, message, detail=True):
+        """
+        记录日志到缓冲区，由_flush_log统一输出，避免循环内逐行刷新Script Editor
+        
+        Args:
+            message (str): 日志内容
+            detail (bool): 是否为逐个mesh的详细信息（仅verbose模式下记录）
+        """
+        if detail and not self.verbose:
+            return
+        self._log_buf.append(message)
+    
+    def _flush_log(self):
+        """一次性输出缓冲区中的日志"""
+        if self._log_buf:
+            print("\n".join(self._log_buf))
+            self._log_buf.clear()
+    
     def _find_abc_meshes(self, new_transforms, abc_node):
         """查找ABC meshes"""
         try:
             abc_meshes = {}
             
             print(f"查找ABC meshes，共 {len(new_transforms)} 个新对象")
-            
-            for transform in new_transforms:
-                try:
-                    # 获取mesh shape
-                    mesh_shapes = cmds.listRelatives(transform, shapes=True, type='mesh', fullPath=True)
-                    if mesh_shapes:
-                        mesh_shape = mesh_shapes[0]
-                        
-                        # 获取不带命名空间的名称
-                        clean_name = self._clean_mesh_name(transform)
-                        
-                        # 检查是否连接到ABC节点
-                        if abc_node:
-                            connections = cmds.listConnections(mesh_shape, source=True, type='AlembicNode')
-                            if connections and abc_node in connections:
-                                abc_meshes[clean_name] = {
-                                    'transform': transform,
-                                    'shape': mesh_shape,
-                                    'original_name': transform.split('|')[-1]
-                                }
-                                print(f"  ABC mesh: {clean_name} -> {transform}")
-                        else:
-                            # 如果没有ABC节点，直接添加所有mesh
-                            abc_meshes[clean_name] = {
-                                'transform': transform,
-                                'shape': mesh_shape,
-                                'original_name': transform.split('|')[-1]
-                            }
-                            print(f"  导入mesh: {clean_name} -> {transform}")
-                            
-                except Exception as e:
-                    print(f"  跳过对象 {transform}: {str(e)}")
-                    continue
-            
+
+            if not new_transforms:
+                return abc_meshes
+
+            # 一次性获取ABC节点下游的所有节点（shape和transform），
+            # 之后只需做集合成员判断，不再逐个查询连接
+            abc_downstream = None
+            if abc_node:
+                abc_downstream = self._get_downstream_dag_nodes(self._get_dependency_node(abc_node))
+
+            # 通过API一次性解析所有transform，直接读取子节点中的mesh shape（包括中间对象）
+            transform_shapes = {}
+            for transform_path in self._get_dag_paths(new_transforms):
+                mesh_shapes = []
+                for i in range(transform_path.childCount()):
+                    child = transform_path.child(i)
+                    if child.hasFn(om2.MFn.kMesh):
+                        mesh_path = om2.MDagPath(transform_path)
+                        mesh_path.push(child)
+                        mesh_shapes.append(mesh_path)
+                if mesh_shapes:
+                    transform_shapes[transform_path.fullPathName()] = mesh_shapes
+
+            for transform, mesh_paths in transform_shapes.items():
+                shape_names = [mesh_path.fullPathName() for mesh_path in mesh_paths]
+
+                # 检查是否连接到ABC节点：任一shape或transform在ABC下游即可，
+                # 优先使用ABC直接驱动的shape，其次是第一个非中间形状
+                if abc_downstream is not None:
+                    driven_shapes = [name for name in shape_names if name in abc_downstream]
+                    if not driven_shapes and transform not in abc_downstream:
+                        continue
+                else:
+                    driven_shapes = []
+
+                if driven_shapes:
+                    mesh_shape = driven_shapes[0]
+                else:
+                    mesh_shape = next(
+                        (name for name, mesh_path in zip(shape_names, mesh_paths)
+                         if not om2.MFnDagNode(mesh_path).isIntermediateObject),
+                        shape_names[0]
+                    )
+
+                # 获取不带命名空间的名称
+                clean_name = self._clean_mesh_name(transform)
+
+                if abc_downstream is not None:
+                    self._log(f"  ABC mesh: {clean_name} -> {transform}")
+                else:
+                    # 如果没有ABC节点，直接添加所有mesh
+                    self._log(f"  导入mesh: {clean_name} -> {transform}")
+
+                abc_meshes[clean_name] = {
+                    'transform': transform,
+                    'shape': mesh_shape,
+                    'original_name': transform.rpartition('|')[2]
+                }
+
+            self._flush_log()
             print(f"找到 {len(abc_meshes)} 个有效ABC mesh")
             return abc_meshes
             
         except Exception as e:
+            self._flush_log()
             print(f"查找ABC meshes失败: {str(e)}")
             return {}
     
@@ -630,48 +840,127 @@ class ABCImporter:
             
             print(f"开始连接 {total_abc} 个ABC mesh到Lookdev")
             
-            # 创建名称映射
+            self._pending_weights = []
+            self._pending_targets = {}
+            # 场景可能已变化，每次连接重新查询blendShape
+            self._blendshape_cache = {}
+            # 添加到已有blendShape的连接 {ABC transform: (ABC名称, Lookdev名称)}，目标实际添加后才计入
+            queued_connections = {}
+            
+            # 创建名称映射，并一次性预计算lookdev名称的匹配索引
             lookdev_names = list(lookdev_meshes.keys())
+            lookdev_index = self._build_lookdev_index(lookdev_names)
             
             for abc_name, abc_info in abc_meshes.items():
                 try:
                     # 查找最佳匹配
-                    best_match = self._find_best_mesh_match(abc_name, lookdev_names)
+                    best_match = self._find_best_mesh_match(abc_name, lookdev_index)
                     
                     if best_match and best_match in lookdev_meshes:
                         lookdev_info = lookdev_meshes[best_match]
                         
+                        # 已有blendShape时目标只是登记，结果在批量添加后确定
+                        queued = self._find_blendshape_for_mesh(lookdev_info['shape']) is not None
+                        
                         # 创建连接
                         success = self._create_mesh_connection(abc_info, lookdev_info, lookdev_namespace)
                         
-                        if success:
-                            connected_count += 1
-                            print(f"  ✅ 连接: {abc_name} -> {best_match}")
+                        if not success:
+                            self._log(f"  ❌ 连接失败: {abc_name} -> {best_match}", detail=False)
+                        elif queued:
+                            queued_connections[abc_info['transform']] = (abc_name, best_match)
                         else:
-                            print(f"  ❌ 连接失败: {abc_name} -> {best_match}")
+                            connected_count += 1
+                            self._log(f"  ✅ 连接: {abc_name} -> {best_match}")
                     else:
-                        print(f"  ⚠️  未找到匹配: {abc_name}")
+                        self._log(f"  ⚠️  未找到匹配: {abc_name}", detail=False)
                         
                 except Exception as e:
-                    print(f"  ❌ 连接 {abc_name} 时出错: {str(e)}")
+                    self._log(f"  ❌ 连接 {abc_name} 时出错: {str(e)}", detail=False)
                     continue
             
+            # 按blendShape节点批量添加目标，再一次性设置权重，只触发一次求值图重建
+            for abc_transform in self._apply_pending_targets():
+                abc_name, best_match = queued_connections[abc_transform]
+                connected_count += 1
+                self._log(f"  ✅ 连接: {abc_name} -> {best_match}")
+            self._apply_pending_weights()
+            
+            self._flush_log()
             print(f"连接完成: {connected_count}/{total_abc}")
             return connected_count > 0
             
         except Exception as e:
+            self._flush_log()
             print(f"连接meshes失败: {str(e)}")
             return False
     
-    def _find_best_mesh_match(self, abc_name, lookdev_names):
+    def _build_lookdev_index(self, lookdev_names):
+        """
+        预计算lookdev名称的匹配索引
+        
+        只立即构建完全匹配索引；关键词打分所需的条目和倒排索引在第一次
+        出现非完全匹配时才由_ensure_keyword_index补齐，名称全部完全匹配时无需提取关键词
+        
+        Args:
+            lookdev_names (list): Lookdev mesh名称列表
+            
+        Returns:
+            dict: 匹配索引
+                names为lookdev名称列表，
+                exact为 {小写名称: 名称} 完全匹配索引，
+                entries为 [(名称, 小写名称, 关键词集合, 特殊关键词掩码)]（延迟构建），
+                keywords为 {关键词: [名称]} 倒排索引（延迟构建）
+        """
+        exact_index = {}
+        for lookdev_name in lookdev_names:
+            # 同名时保留第一个，与逐个打分时的结果一致
+            exact_index.setdefault(lookdev_name.lower(), lookdev_name)
+        
+        return {'names': lookdev_names, 'exact': exact_index, 'entries': None, 'keywords': None}
+    
+    def _ensure_keyword_index(self, lookdev_index):
+        """按需构建关键词打分所需的条目和倒排索引，只构建一次"""
+        if lookdev_index['entries'] is not None:
+            return lookdev_index['entries'], lookdev_index['keywords']
+        
+        entries = []
+        keyword_index = {}
+        for lookdev_name in lookdev_index['names']:
+            lookdev_clean = lookdev_name.lower()
+            keywords = frozenset(self._extract_mesh_keywords(lookdev_clean))
+            entries.append((lookdev_name, lookdev_clean, keywords, _special_bits(lookdev_clean)))
+            
+            for keyword in keywords:
+                keyword_index.setdefault(keyword, []).append(lookdev_name)
+        
+        lookdev_index['entries'] = entries
+        lookdev_index['keywords'] = keyword_index
+        return entries, keyword_index
+    
+    def _find_best_mesh_match(self, abc_name, lookdev_index):
         """查找最佳mesh匹配"""
         abc_clean = abc_name.lower()
+        
+        # 完全匹配是最常见的情况，直接查表返回，无需打分
+        exact_match = lookdev_index['exact'].get(abc_clean)
+        if exact_match is not None:
+            return exact_match
+        
+        entries, keyword_index = self._ensure_keyword_index(lookdev_index)
+        abc_keywords = frozenset(self._extract_mesh_keywords(abc_clean))
         best_match = None
         best_score = 0
         
-        for lookdev_name in lookdev_names:
-            lookdev_clean = lookdev_name.lower()
-            
+        # 通过倒排索引统计共同关键词数量，没有共同关键词的名称相似度为0
+        common_counts = {}
+        for keyword in abc_keywords:
+            for lookdev_name in keyword_index.get(keyword, ()):
+                common_counts[lookdev_name] = common_counts.get(lookdev_name, 0) + 1
+        
+        abc_bits = _special_bits(abc_clean)
+        
+        for lookdev_name, lookdev_clean, lookdev_keywords, lookdev_bits in entries:
             # 计算匹配分数
             score = 0
             
@@ -682,16 +971,22 @@ class ABCImporter:
             elif abc_clean in lookdev_clean or lookdev_clean in abc_clean:
                 score = 80
             # 特殊规则匹配
-            elif self._is_special_mesh_pair(abc_clean, lookdev_clean):
+            elif abc_bits & lookdev_bits:
                 score = 90
-            # 相似度匹配
+            # 相似度匹配（关键词Jaccard系数）
             else:
-                similarity = self._calculate_string_similarity(abc_clean, lookdev_clean)
-                score = int(similarity * 60)
+                common = common_counts.get(lookdev_name, 0)
+                if common:
+                    similarity = self._keyword_similarity(abc_keywords, lookdev_keywords, common)
+                    score = int(similarity * 60)
             
             if score > best_score:
                 best_score = score
                 best_match = lookdev_name
+                # 完全匹配已在查表时返回，循环内最高只能是特殊规则的90分，
+                # 后续名称无法超过（同分保留先出现的），直接结束
+                if best_score >= 90:
+                    break
         
         return best_match if best_score > 30 else None
     
@@ -701,26 +996,40 @@ class ABCImporter:
             return 0.0
         
         # 提取关键词进行比较
-        keywords1 = self._extract_mesh_keywords(str1)
-        keywords2 = self._extract_mesh_keywords(str2)
+        keywords1 = frozenset(self._extract_mesh_keywords(str1))
+        keywords2 = frozenset(self._extract_mesh_keywords(str2))
         
+        return self._keyword_similarity(keywords1, keywords2)
+    
+    def _keyword_similarity(self, keywords1, keywords2, common_count=None):
+        """
+        计算两个关键词集合的Jaccard相似度
+        
+        Args:
+            keywords1 (frozenset): 关键词集合1
+            keywords2 (frozenset): 关键词集合2
+            common_count (int): 已知的共同关键词数量（如来自倒排索引），为None时现场计算
+            
+        Returns:
+            float: 相似度 (0.0 - 1.0)
+        """
         if not keywords1 or not keywords2:
             return 0.0
         
-        # 计算关键词匹配度
-        common_keywords = len(set(keywords1) & set(keywords2))
-        total_keywords = len(set(keywords1) | set(keywords2))
+        if common_count is None:
+            common_count = len(keywords1 & keywords2)
         
-        return common_keywords / total_keywords if total_keywords > 0 else 0.0
+        # |A ∪ B| = |A| + |B| - |A ∩ B|，无需构造并集
+        return common_count / (len(keywords1) + len(keywords2) - common_count)
     
     def _extract_mesh_keywords(self, name):
         """提取mesh名称关键词"""
         # 移除常见前缀和后缀
-        cleaned = re.sub(r'^(chr_|prop_|env_|set_)', '', name.lower())
-        cleaned = re.sub(r'(_shape|_mesh|_geo)$', '', cleaned)
+        cleaned = _PREFIX_RE.sub('', name.lower())
+        cleaned = _SUFFIX_RE.sub('', cleaned)
         
         # 分割关键词
-        keywords = re.split(r'[_\-\s]+', cleaned)
+        keywords = _SPLIT_RE.split(cleaned)
         
         # 过滤短词和数字
         keywords = [k for k in keywords if len(k) > 1 and not k.isdigit()]
@@ -728,28 +1037,12 @@ class ABCImporter:
         return keywords
     
     def _is_special_mesh_pair(self, abc_name, lookdev_name):
-        """检查是否是特殊mesh配对"""
-        # 定义特殊配对规则
-        special_pairs = [
-            ('body', 'body'),
-            ('face', 'face'), 
-            ('hair', 'hair'),
-            ('cloth', 'cloth'),
-            ('eye', 'eye'),
-            ('teeth', 'teeth'),
-            ('tongue', 'tongue'),
-        ]
-        
-        for abc_key, lookdev_key in special_pairs:
-            if abc_key in abc_name and lookdev_key in lookdev_name:
-                return True
-        
-        return False
+        """检查是否是特殊mesh配对（两者包含相同的特殊关键词）"""
+        return (_special_bits(abc_name) & _special_bits(lookdev_name)) != 0
     
     def _create_mesh_connection(self, abc_info, lookdev_info, lookdev_namespace):
         """创建mesh连接"""
         try:
-            abc_shape = abc_info['shape']
             lookdev_shape = lookdev_info['shape']
             
             # 查找lookdev mesh的blendShape节点
@@ -758,7 +1051,7 @@ class ABCImporter:
             if blendshape_node:
                 # 添加ABC作为blendShape目标
                 success = self._add_abc_as_blendshape_target(
-                    blendshape_node, abc_shape, lookdev_shape, abc_info['original_name']
+                    blendshape_node, abc_info['transform'], lookdev_info['transform'], abc_info['original_name']
                 )
                 return success
             else:
@@ -767,76 +1060,181 @@ class ABCImporter:
                     # 交换源和目标（lookdev驱动abc）
                     blend_node = cmds.blendShape(lookdev_info['transform'], abc_info['transform'])
                     if blend_node:
-                        cmds.setAttr(f"{blend_node[0]}.weight[0]", 1.0)
+                        # lookdev shape此时已连接到新节点，同步缓存
+                        self._blendshape_cache[lookdev_shape] = blend_node[0]
+                        self._pending_weights.append((blend_node[0], 0, 1.0))
                         return True
-                except:
+                except (RuntimeError, ValueError):
                     return False
             
             return False
             
         except Exception as e:
-            print(f"    创建连接失败: {str(e)}")
+            self._log(f"    创建连接失败: {str(e)}", detail=False)
             return False
     
+    def _apply_pending_weights(self):
+        """通过单个MDGModifier一次性设置所有待处理的blendShape权重"""
+        if not self._pending_weights:
+            return
+        
+        modifier = om2.MDGModifier()
+        queued_weights = []
+        for blendshape_node, index, value in self._pending_weights:
+            try:
+                weight_plug = om2.MFnDependencyNode(self._get_dependency_node(blendshape_node)).findPlug('weight', False)
+                modifier.newPlugValueFloat(weight_plug.elementByLogicalIndex(index), value)
+                queued_weights.append((blendshape_node, index, value))
+            except RuntimeError as e:
+                self._log(f"    设置blendShape权重失败: {blendshape_node}.weight[{index}] ({str(e)})", detail=False)
+        
+        try:
+            modifier.doIt()
+        except RuntimeError:
+            # 批量设置失败（如部分权重已被连接）时逐个设置，只记录失败的权重
+            for blendshape_node, index, value in queued_weights:
+                try:
+                    cmds.setAttr(f"{blendshape_node}.weight[{index}]", value)
+                except RuntimeError as e:
+                    self._log(f"    设置blendShape权重失败: {blendshape_node}.weight[{index}] ({str(e)})", detail=False)
+        
+        self._pending_weights = []
+    
     def _find_blendshape_for_mesh(self, mesh_shape):
-        """查找mesh的blendShape节点"""
+        """查找mesh的blendShape节点（同一次连接中多个ABC mesh可能匹配到同一个lookdev mesh，结果缓存复用）"""
+        if mesh_shape in self._blendshape_cache:
+            return self._blendshape_cache[mesh_shape]
+        
+        blendshape_node = self._query_blendshape_for_mesh(mesh_shape)
+        self._blendshape_cache[mesh_shape] = blendshape_node
+        return blendshape_node
+    
+    def _query_blendshape_for_mesh(self, mesh_shape):
+        """通过API查询与mesh相连的blendShape节点"""
         try:
-            blendshape_nodes = cmds.listConnections(mesh_shape, type='blendShape')
-            return blendshape_nodes[0] if blendshape_nodes else None
-        except:
+            mesh_fn = om2.MFnDependencyNode(self._get_dependency_node(mesh_shape))
+            for plug in mesh_fn.getConnections():
+                for other_plug in plug.connectedTo(True, True):
+                    other_node = other_plug.node()
+                    if other_node.hasFn(om2.MFn.kBlendShape):
+                        return om2.MFnDependencyNode(other_node).name()
+            return None
+        except RuntimeError:
             return None
     
-    def _add_abc_as_blendshape_target(self, blendshape_node, abc_shape, lookdev_shape, abc_name):
-        """添加ABC作为blendShape目标"""
+    def _add_abc_as_blendshape_target(self, blendshape_node, abc_transform, lookdev_transform, abc_name):
+        """
+        登记ABC作为blendShape目标，在_connect_meshes结束时按节点批量添加
+        
+        Args:
+            blendshape_node (str): blendShape节点
+            abc_transform (str): ABC mesh的transform（完整路径，来自_find_abc_meshes）
+            lookdev_transform (str): Lookdev mesh的transform（完整路径）
+            abc_name (str): ABC mesh名称
+        """
         try:
-            # 查找可用的输入槽
-            input_index = self._find_available_blendshape_input(blendshape_node)
-            if input_index is None:
-                print(f"    blendShape节点没有可用输入槽")
-                return False
-            
-            # 获取ABC的transform（确保使用完整路径）
-            abc_transform = cmds.listRelatives(abc_shape, parent=True, fullPath=True)
-            if not abc_transform:
-                print(f"    无法获取ABC的transform节点")
-                return False
-            abc_transform = abc_transform[0]
-            
-            # 获取lookdev的transform（确保使用完整路径）
-            lookdev_transform = cmds.listRelatives(lookdev_shape, parent=True, fullPath=True)
-            if not lookdev_transform:
-                print(f"    无法获取lookdev的transform节点")
-                return False
-            lookdev_transform = lookdev_transform[0]
-            
             # 获取非中间形状的shape节点
             abc_shape_final = self._get_non_intermediate_shape(abc_transform)
             lookdev_shape_final = self._get_non_intermediate_shape(lookdev_transform)
             
             if not abc_shape_final or not lookdev_shape_final:
-                print(f"    无法获取非中间形状节点")
+                self._log(f"    无法获取非中间形状节点", detail=False)
                 return False
             
-            # 添加blendShape目标 - 交换源和目标（lookdev驱动abc）
-            cmds.blendShape(blendshape_node, edit=True, 
-                          target=(abc_transform, input_index, lookdev_transform, 1.0))
-            
-            # 设置权重为1
-            cmds.setAttr(f"{blendshape_node}.weight[{input_index}]", 1.0)
-            
+            self._pending_targets.setdefault(blendshape_node, []).append(
+                (abc_transform, lookdev_transform, abc_name)
+            )
             return True
             
         except Exception as e:
-            error_msg = str(e)
-            if "More than one object matches name" in error_msg:
-                print(f"    ❌ 名称冲突: {error_msg}")
-                print(f"    💡 建议: 检查场景中是否有重复的中间形状对象")
-                print(f"    💡 ABC: {abc_transform}")
-                print(f"    💡 Lookdev: {lookdev_transform}")
-            else:
-                print(f"    添加ABC blendShape目标失败: {error_msg}")
+            self._log(f"    添加ABC blendShape目标失败: {str(e)}", detail=False)
             return False
     
+    def _apply_pending_targets(self):
+        """
+        按blendShape节点批量添加待处理的目标，每个节点只调用一次blendShape编辑
+        
+        Returns:
+            list: 成功添加为目标的ABC transform
+        """
+        added_transforms = []
+        
+        for blendshape_node, targets in self._pending_targets.items():
+            # 查找可用的输入槽，同一节点的目标依次占用后续索引
+            input_index = self._find_available_blendshape_input(blendshape_node)
+            if input_index is None:
+                self._log(f"    blendShape节点没有可用输入槽: {blendshape_node}", detail=False)
+                continue
+            
+            # 添加blendShape目标 - 交换源和目标（lookdev驱动abc）
+            entries = [
+                (abc_transform, input_index + offset, lookdev_transform, 1.0)
+                for offset, (abc_transform, lookdev_transform, _) in enumerate(targets)
+            ]
+            try:
+                cmds.blendShape(blendshape_node, edit=True, target=entries)
+            except RuntimeError:
+                entries = self._retry_pending_targets(blendshape_node, entries, targets)
+            
+            # 权重为1，在_connect_meshes结束时统一设置
+            for entry in entries:
+                self._pending_weights.append((blendshape_node, entry[1], 1.0))
+                added_transforms.append(entry[0])
+        
+        self._pending_targets = {}
+        return added_transforms
+    
+    def _retry_pending_targets(self, blendshape_node, entries, targets):
+        """
+        批量添加失败后逐个添加，定位出错的目标
+        
+        批量编辑可能在出错前已添加了部分目标，这些索引已存在的目标不再重复添加，
+        其余目标重新查找可用输入槽后逐个添加
+        
+        Args:
+            blendshape_node (str): blendShape节点
+            entries (list): 批量添加时使用的 (ABC transform, 索引, Lookdev transform, 权重)
+            targets (list): 对应的 (ABC transform, Lookdev transform, ABC名称)
+            
+        Returns:
+            list: 实际添加成功的条目
+        """
+        try:
+            existing_indices = set(cmds.getAttr(f"{blendshape_node}.weight", multiIndices=True) or [])
+        except (RuntimeError, ValueError):
+            existing_indices = set()
+        
+        added = []
+        for entry, (abc_transform, lookdev_transform, abc_name) in zip(entries, targets):
+            # 批量编辑前这些索引都未使用，已存在说明该目标已添加
+            if entry[1] in existing_indices:
+                added.append(entry)
+                continue
+            
+            input_index = self._find_available_blendshape_input(blendshape_node)
+            if input_index is None:
+                self._log(f"    blendShape节点没有可用输入槽: {blendshape_node}", detail=False)
+                continue
+            
+            entry = (abc_transform, input_index, lookdev_transform, 1.0)
+            try:
+                cmds.blendShape(blendshape_node, edit=True, target=entry)
+                added.append(entry)
+            except RuntimeError as e:
+                self._log_target_error(str(e), abc_transform, lookdev_transform, abc_name)
+        
+        return added
+    
+    def _log_target_error(self, error_msg, abc_transform, lookdev_transform, abc_name):
+        """输出添加blendShape目标失败的信息"""
+        if "More than one object matches name" in error_msg:
+            self._log(f"    ❌ 名称冲突: {error_msg}", detail=False)
+            self._log(f"    💡 建议: 检查场景中是否有重复的中间形状对象", detail=False)
+            self._log(f"    💡 ABC: {abc_transform}", detail=False)
+            self._log(f"    💡 Lookdev: {lookdev_transform}", detail=False)
+        else:
+            self._log(f"    添加ABC blendShape目标失败 ({abc_name}): {error_msg}", detail=False)
+    
     def _get_non_intermediate_shape(self, transform):
         """获取transform下的非中间形状节点"""
         try:
@@ -853,55 +1251,58 @@ class ABCImporter:
     def _find_available_blendshape_input(self, blendshape_node):
         """查找blendShape节点的可用输入槽"""
         try:
-            # 获取所有权重属性
-            weight_attrs = cmds.listAttr(blendshape_node, string='weight*')
-            if not weight_attrs:
+            # 直接获取权重数组已使用的索引，无需列出属性名再解析
+            weight_indices = cmds.getAttr(f"{blendshape_node}.weight", multiIndices=True)
+            if not weight_indices:
                 return 0
             
-            # 找到最大的索引
-            max_index = -1
-            for attr in weight_attrs:
-                index_match = re.search(r'\[(\d+)\]', attr)
-                if index_match:
-                    index = int(index_match.group(1))
-                    max_index = max(max_index, index)
+            return max(weight_indices) + 1
             
-            return max_index + 1
-            
-        except:
+        except (RuntimeError, ValueError):
             return None
     
     def _hide_abc_meshes(self, abc_meshes):
         """隐藏ABC meshes"""
         try:
-            for abc_name, abc_info in abc_meshes.items():
+            transforms = [abc_info['transform'] for abc_info in abc_meshes.values()]
+            
+            # 将所有visibility修改排入同一个MDGModifier，一次性执行
+            # 锁定或被连接（如ABC驱动的可见性动画）的plug无法设置，直接跳过
+            modifier = om2.MDGModifier()
+            queued_transforms = []
+            for transform_path in self._get_dag_paths(transforms):
                 try:
-                    cmds.setAttr(f"{abc_info['transform']}.visibility", 0)
-                except:
+                    visibility_plug = om2.MFnDagNode(transform_path).findPlug('visibility', False)
+                except RuntimeError:
+                    continue
+                
+                if visibility_plug.isLocked or visibility_plug.isDestination:
                     continue
+                
+                modifier.newPlugValueBool(visibility_plug, False)
+                queued_transforms.append(transform_path.fullPathName())
+            
+            try:
+                modifier.doIt()
+                hidden_count = len(queued_transforms)
+            except RuntimeError:
+                # 批量设置失败时逐个设置，跳过失败的mesh，其余照常隐藏
+                hidden_count = 0
+                for transform in queued_transforms:
+                    try:
+                        cmds.setAttr(f"{transform}.visibility", False)
+                        hidden_count += 1
+                    except RuntimeError:
+                        continue
             
-            print(f"已隐藏 {len(abc_meshes)} 个ABC mesh")
+            print(f"已隐藏 {hidden_count} 个ABC mesh")
             
         except Exception as e:
             print(f"隐藏ABC meshes失败: {str(e)}")
     
     def _clean_mesh_name(self, transform_name):
         """清理mesh名称"""
-        # 获取最后一部分（去除路径）
-        name = transform_name.split('|')[-1]
-        
-        # 移除命名空间
-        if ':' in name:
-            name = name.split(':')[-1]
-        
-        # 移除数字后缀
-        name = re.sub(r'_\d+$', '', name)
-        
-        # 移除Shape后缀
-        if name.endswith('Shape'):
-            name = name[:-5]
-        
-        return name
+        return _clean_mesh_name(transform_name)
     
     def add_pending_abc(self, abc_file):
         """添加待连接的ABC文件"""
@@ -915,6 +1316,37 @@ class ABCImporter:
         """设置时间范围"""
         self.time_range = [start_frame, end_frame]
     
+    def apply_time_range(self):
+        """
+        将记录的时间范围应用到场景时间轴
+        
+        导入过程中只更新self.time_range，由组装流程在所有导入完成后调用一次，
+        避免每次修改playbackOptions/currentTime都触发整个场景重新求值
+        
+        Returns:
+            bool: 是否成功
+        """
+        try:
+            start_frame, end_frame = self.time_range
+            
+            # 退出时恢复原有的暂停状态，避免解除外层调用者的暂停
+            refresh_suspended = cmds.refresh(query=True, suspend=True)
+            cmds.refresh(suspend=True)
+            try:
+                # 播放范围和动画范围（时间轴的开始和结束）
+                cmds.playbackOptions(minTime=start_frame, maxTime=end_frame,
+                                     animationStartTime=start_frame, animationEndTime=end_frame)
+                cmds.currentTime(start_frame + 10)
+            finally:
+                cmds.refresh(suspend=refresh_suspended)
+            
+            print(f"✅ 场景时间范围已设置为: {start_frame} - {end_frame}")
+            return True
+            
+        except Exception as e:
+            print(f"❌ 设置场景时间范围失败: {str(e)}")
+            return False
+    
     def get_imported_abc_nodes(self):
         """获取已导入的ABC节点列表"""
         return self.imported_abc_nodes
@@ -975,18 +1407,27 @@ class FurCacheImporter(ABCImporter):
             # 替换模板中的变量
             fur_cache_path = template.replace('${DESC}', asset_name)
             
-            if os.path.exists(fur_cache_path):
-                return fur_cache_path
-            
-            # 尝试其他可能的路径
+            # 按优先级排列的候选路径
             possible_paths = [
+                fur_cache_path,
                 fur_cache_path.replace(asset_name, f"{asset_name}_01"),
                 fur_cache_path.replace(asset_name, f"{asset_name}_hair"),
                 fur_cache_path.replace('.abc', '_01.abc'),
             ]
             
+            # 每个目录只列举一次，之后用集合判断文件是否存在，
+            # 避免网络存储上逐个路径stat的往返开销
+            dir_entries = {}
             for path in possible_paths:
-                if os.path.exists(path):
+                parent, file_name = os.path.split(path)
+                if parent not in dir_entries:
+                    try:
+                        with os.scandir(parent or '.') as entries:
+                            dir_entries[parent] = {os.path.normcase(entry.name) for entry in entries}
+                    except OSError:
+                        dir_entries[parent] = set()
+                
+                if os.path.normcase(file_name) in dir_entries[parent]:
                     return path
             
             return None
@@ -1005,10 +1446,17 @@ class FurCacheImporter(ABCImporter):
                 f"|{lookdev_namespace}:growthmesh_grp",
             ]
             
+            # 使用MSelectionList直接解析路径，不存在的路径会抛出异常，无需objExists逐个探测
             for path in possible_paths:
-                if cmds.objExists(path):
-                    print(f"找到growthmesh组: {path}")
-                    return path
+                sel = om2.MSelectionList()
+                try:
+                    sel.add(path)
+                except RuntimeError:
+                    continue
+                
+                found_path = sel.getDagPath(0).fullPathName()
+                print(f"找到growthmesh组: {found_path}")
+                return found_path
             
             print("未找到growthmesh组")
             return None
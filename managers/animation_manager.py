@@ -8,6 +8,7 @@ import maya.cmds as cmds
 import os
 import re
 import glob
+from concurrent.futures import ThreadPoolExecutor
 
 # 简化的直接导入
 try:
@@ -17,9 +18,27 @@ except ImportError:
     from blendshape_manager import BlendshapeManager
 
 
+def _collect_version_files(template):
+    """
+    遍历模板匹配的文件并从路径中提取版本号（纯文件I/O，可在工作线程中执行，不输出日志）
+    
+    Returns:
+        tuple: (是否匹配到任何文件, [(版本号, 文件路径)])
+    """
+    found_any = False
+    version_files = []
+    for file_path in glob.iglob(template):
+        found_any = True
+        # 从路径中提取版本号 (如 v001, v002)
+        version_match = re.search(r'/(v\d+)/', file_path.replace('\\', '/'))
+        if version_match:
+            version_files.append((version_match.group(1), file_path))
+    return found_any, version_files
+
+
 def import_abc_to_group(abc_path, namespace='cloth', group_name='group'):
-    # 记录导入前的命名空间
-    existing_namespaces = cmds.namespaceInfo(listOnlyNamespaces=True) or []
+    # 记录导入前的命名空间（集合，便于后面做成员判断）
+    existing_namespaces = set(cmds.namespaceInfo(listOnlyNamespaces=True) or [])
 
     # 1) 导入 Alembic
     cmds.file(
@@ -117,8 +136,9 @@ def import_abc_to_group(abc_path, namespace='cloth', group_name='group'):
 class AnimationManager:
     """动画管理器"""
 
-    def __init__(self):
-        self.blendshape_manager = BlendshapeManager()
+    def __init__(self, verbose=False):
+        self.blendshape_manager = BlendshapeManager(verbose=verbose)
+        self.verbose = verbose  # 是否输出查找组时的详细调试信息
         self.animation_files = []
         self.fur_files = []
         self.cloth_files = []
@@ -126,6 +146,7 @@ class AnimationManager:
         self.cloth_namespace = "asset_cloth"
         self.actual_fur_namespace = None
         self.actual_cloth_namespace = None
+        self._lookdev_target_group = None  # 已找到的Lookdev目标组（毛发/布料共用）
 
     def set_animation_files(self, animation_files):
         """设置动画文件列表"""
@@ -143,6 +164,7 @@ class AnimationManager:
 
         self.fur_files = []
         self.cloth_files = []
+        self._lookdev_target_group = None
 
         # 如果没有找到CFX文件，使用基于模板路径的查找方法（旧版本逻辑）
         if len(self.fur_files) == 0 and len(self.cloth_files) == 0:
@@ -163,14 +185,20 @@ class AnimationManager:
                 sequence=sequence, shot=shot, lookdev_namespace=lookdev_namespace.replace("_lookdev", '')
             )
 
-            # 查找毛发文件
-            fur_file = self._find_fur_cache_file(hair_template)
+            # 毛发和布料缓存的glob都是纯文件I/O（网络盘延迟为主），在工作线程中并行遍历；
+            # 日志输出和版本选择在主线程中依次进行，避免Script Editor中的输出交错
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                fur_future = executor.submit(_collect_version_files, hair_template)
+                cloth_future = executor.submit(_collect_version_files, cloth_template)
+                fur_file = self._find_fur_cache_file(hair_template, fur_future)
+                cloth_file = self._find_cloth_cache_file(cloth_template, lookdev_namespace, cloth_future)
+
+            # 记录毛发文件
             if fur_file:
                 self.fur_files.append(fur_file)
                 print(f"  基于模板找到毛发文件: {os.path.basename(fur_file)}")
 
-            # 查找布料文件
-            cloth_file = self._find_cloth_cache_file(cloth_template, lookdev_namespace)
+            # 记录布料文件
             if cloth_file:
                 self.cloth_files.append(cloth_file)
                 print(f"  基于模板找到布料文件: {os.path.basename(cloth_file)}")
@@ -178,29 +206,27 @@ class AnimationManager:
         except Exception as e:
             print(f"基于模板查找CFX文件失败: {str(e)}")
 
-    def _find_fur_cache_file(self, hair_template):
-        """查找毛发解算文件（基于新版本逻辑，默认返回最新版本）"""
+    def _find_fur_cache_file(self, hair_template, scan_future=None):
+        """
+        查找毛发解算文件（基于新版本逻辑，默认返回最新版本）
+        
+        Args:
+            hair_template (str): 毛发缓存模板路径
+            scan_future (Future): 工作线程中_collect_version_files的结果，为None时在当前线程遍历
+        """
         try:
             print(f"毛发模板路径: {hair_template}")
 
-            # 获取所有匹配的文件路径
-            all_files = glob.glob(hair_template)
+            # 获取匹配的文件路径及其版本号
+            if scan_future is not None:
+                found_any, version_files = scan_future.result()
+            else:
+                found_any, version_files = _collect_version_files(hair_template)
 
-            if not all_files:
+            if not found_any:
                 print("未找到任何匹配的文件")
                 return None
 
-            # 从文件路径中提取版本号并分组
-            version_files = []
-            for file_path in all_files:
-                # 从路径中提取版本号 (如 v001, v002)
-                version_match = re.search(
-                    r'/(v\d+)/', file_path.replace('\\', '/')
-                )
-                if version_match:
-                    version = version_match.group(1)
-                    version_files.append((version, file_path))
-
             if not version_files:
                 print("未找到任何版本目录")
                 return None
@@ -220,28 +246,29 @@ class AnimationManager:
             traceback.print_exc()
             return None
 
-    def _find_cloth_cache_file(self, hair_template, lookdev_namespace):
-        """查找布料解算文件（基于新版本路径逻辑，默认返回最新版本）"""
+    def _find_cloth_cache_file(self, hair_template, lookdev_namespace, scan_future=None):
+        """
+        查找布料解算文件（基于新版本路径逻辑，默认返回最新版本）
+        
+        Args:
+            hair_template (str): 布料缓存模板路径
+            lookdev_namespace (str): Lookdev命名空间
+            scan_future (Future): 工作线程中_collect_version_files的结果，为None时在当前线程遍历
+        """
         try:
             print(f"布料模板路径: {hair_template}")
 
 
-            # 查找所有匹配的ABC文件
-            all_cloth_files = glob.glob(hair_template)
+            # 获取匹配的ABC文件及其版本号
+            if scan_future is not None:
+                found_any, version_files = scan_future.result()
+            else:
+                found_any, version_files = _collect_version_files(hair_template)
 
-            if not all_cloth_files:
+            if not found_any:
                 print("未找到任何布料文件")
                 return None
 
-            # 从文件路径中提取版本号并分组
-            version_files = []
-            for file_path in all_cloth_files:
-                # 从路径中提取版本号
-                version_match = re.search(r'/(v\d+)/', file_path.replace('\\', '/'))
-                if version_match:
-                    version = version_match.group(1)
-                    version_files.append((version, file_path))
-
             if not version_files:
                 print("未找到任何版本的布料文件")
                 return None
@@ -442,7 +469,7 @@ class AnimationManager:
                 try:
                     cmds.setAttr(cloth_group + '.visibility', 0)
                     print("已隐藏cloth组")
-                except:
+                except RuntimeError:
                     pass
                 return True
             else:
@@ -455,19 +482,33 @@ class AnimationManager:
 
     def _find_cloth_group(self):
         """查找cloth组"""
-        if not self.actual_cloth_namespace:
-            return None
+        return self._find_namespace_top_group(self.actual_cloth_namespace, "布料")
 
-        print(f"查找布料组，命名空间: {self.actual_cloth_namespace}")
+    def _find_namespace_top_group(self, namespace, label):
+        """
+        查找命名空间下的顶层组（毛发和布料共用）
+        
+        Args:
+            namespace (str): 实际导入的命名空间
+            label (str): 日志中使用的类型名称（毛发/布料）
+            
+        Returns:
+            str: 顶层组完整路径，未找到返回None
+        """
+        if not namespace:
+            return None
 
-        # 查找布料命名空间下的所有transform
-        transforms = cmds.ls(f"{self.actual_cloth_namespace}:*", type='transform', long=True) or []
-        print(f"布料命名空间下的transform数量: {len(transforms)}")
+        print(f"查找{label}组，命名空间: {namespace}")
 
-        if transforms:
-            print("布料命名空间下的前5个transform:")
-            for i, transform in enumerate(transforms[:5]):
-                print(f"  {i + 1}. {transform}")
+        # 查找命名空间下的所有transform
+        transforms = cmds.ls(f"{namespace}:*", type='transform', long=True) or []
+        if self.verbose:
+            # 调试信息合并为一次输出
+            lines = [f"{label}命名空间下的transform数量: {len(transforms)}"]
+            if transforms:
+                lines.append(f"{label}命名空间下的前5个transform:")
+                lines.extend(f"  {i + 1}. {transform}" for i, transform in enumerate(transforms[:5]))
+            print("\n".join(lines))
 
         # 查找顶层组（没有父节点或父节点不在此命名空间）
         for transform in transforms:
@@ -476,42 +517,47 @@ class AnimationManager:
             # 检查是否是顶层组
             if not parent:
                 # 没有父节点，是顶层组
-                print(f"找到布料顶层组: {transform}")
+                print(f"找到{label}顶层组: {transform}")
                 return transform
-            elif parent and not parent[0].startswith(f"|{self.actual_cloth_namespace}"):
+            elif parent and not parent[0].startswith(f"|{namespace}"):
                 # 父节点不在此命名空间，也是顶层组
-                print(f"找到布料顶层组（跨命名空间）: {transform}")
+                print(f"找到{label}顶层组（跨命名空间）: {transform}")
                 return transform
 
         # 如果没有找到明确的顶层组，尝试查找包含mesh的组
         for transform in transforms:
             children = cmds.listRelatives(transform, children=True, type='mesh') or []
             if children:
-                print(f"找到包含mesh的布料组: {transform}")
+                print(f"找到包含mesh的{label}组: {transform}")
                 return transform
 
-        print("未找到布料组")
+        print(f"未找到{label}组")
         return None
 
     def _find_lookdev_target_group(self):
         """查找Lookdev目标组 - 处理Master>GEO结构"""
+        # 毛发和布料处理都需要同一个Lookdev目标组，找到后复用，避免重复遍历全场景transform
+        if self._lookdev_target_group and cmds.objExists(self._lookdev_target_group):
+            return self._lookdev_target_group
+
         print("查找Lookdev目标组...")
 
-        # 在场景中查找Lookdev命名空间下的组
-        all_transforms = cmds.ls(type='transform', long=True)
+        # 在场景中查找Lookdev命名空间下的组，短名称只计算一次，三轮查找共用
+        all_transforms = [(transform, transform.rpartition('|')[2])
+                          for transform in cmds.ls(type='transform', long=True) or []]
 
         # 优先查找包含lookdev命名空间的组
-        for transform in all_transforms:
-            transform_name = transform.split('|')[-1]
+        for transform, transform_name in all_transforms:
 
             # 查找Lookdev命名空间下的Master>GEO结构
             if ':Master' in transform_name and 'lookdev' in transform_name:
                 # 查找Master下的GEO组
                 geo_children = cmds.listRelatives(transform, children=True, fullPath=True) or []
                 for child in geo_children:
-                    child_name = child.split('|')[-1]
+                    child_name = child.rpartition('|')[2]
                     if ':GEO' in child_name:
                         print(f"找到Lookdev Master>GEO目标组: {child}")
+                        self._lookdev_target_group = child
                         return child
 
             # 也查找直接的GEO组作为备选（Lookdev命名空间）
@@ -519,11 +565,11 @@ class AnimationManager:
                 parent = cmds.listRelatives(transform, parent=True)
                 if not parent:
                     print(f"找到Lookdev GEO目标组: {transform}")
+                    self._lookdev_target_group = transform
                     return transform
 
         # 如果没有找到lookdev命名空间组，查找动画命名空间的GEO组
-        for transform in all_transforms:
-            transform_name = transform.split('|')[-1]
+        for transform, transform_name in all_transforms:
             if ':GEO' in transform_name and 'animation' in transform_name:
                 parent = cmds.listRelatives(transform, parent=True)
                 if not parent:
@@ -531,9 +577,8 @@ class AnimationManager:
                     return transform
 
         # 最后查找普通的GEO组
-        for transform in all_transforms:
-            transform_name = transform.split('|')[-1].lower()
-            if 'geo' in transform_name:
+        for transform, transform_name in all_transforms:
+            if 'geo' in transform_name.lower():
                 parent = cmds.listRelatives(transform, parent=True)
                 if not parent:
                     print(f"找到普通GEO组: {transform}")
@@ -572,7 +617,7 @@ class AnimationManager:
                 try:
                     cmds.setAttr(fur_group + '.visibility', 0)
                     print("已隐藏毛发组")
-                except:
+                except RuntimeError:
                     pass
                 return True
             else:
@@ -585,43 +630,7 @@ class AnimationManager:
 
     def _find_fur_group(self):
         """查找毛发组"""
-        if not self.actual_fur_namespace:
-            return None
-
-        print(f"查找毛发组，命名空间: {self.actual_fur_namespace}")
-
-        # 查找毛发命名空间下的所有transform
-        transforms = cmds.ls(f"{self.actual_fur_namespace}:*", type='transform', long=True) or []
-        print(f"毛发命名空间下的transform数量: {len(transforms)}")
-
-        if transforms:
-            print("毛发命名空间下的前5个transform:")
-            for i, transform in enumerate(transforms[:5]):
-                print(f"  {i + 1}. {transform}")
-
-        # 查找顶层组（没有父节点或父节点不在此命名空间）
-        for transform in transforms:
-            parent = cmds.listRelatives(transform, parent=True, fullPath=True)
-
-            # 检查是否是顶层组
-            if not parent:
-                # 没有父节点，是顶层组
-                print(f"找到毛发顶层组: {transform}")
-                return transform
-            elif parent and not parent[0].startswith(f"|{self.actual_fur_namespace}"):
-                # 父节点不在此命名空间，也是顶层组
-                print(f"找到毛发顶层组（跨命名空间）: {transform}")
-                return transform
-
-        # 如果没有找到明确的顶层组，尝试查找包含mesh的组
-        for transform in transforms:
-            children = cmds.listRelatives(transform, children=True, type='mesh') or []
-            if children:
-                print(f"找到包含mesh的毛发组: {transform}")
-                return transform
-
-        print("未找到毛发组")
-        return None
+        return self._find_namespace_top_group(self.actual_fur_namespace, "毛发")
 
     def handle_special_groups_blendshape(self, lookdev_namespace):
         """处理特殊组的BlendShape连接"""
@@ -662,7 +671,7 @@ class AnimationManager:
         try:
             blendshapes = cmds.ls(type='blendShape') or []
             stats['blendshape_count'] = len(blendshapes)
-        except:
+        except RuntimeError:
             pass
 
         return stats
@@ -694,6 +703,7 @@ class AnimationManager:
             self.cloth_files.clear()
             self.actual_fur_namespace = None
             self.actual_cloth_namespace = None
+            self._lookdev_target_group = None
 
         except Exception as e:
             print(f"清理动画内容失败: {str(e)}")
@@ -8,15 +8,25 @@ BlendShape管理模块（精简版）
 - 创建方向：驱动 -> 目标（blendShape 加在目标上）
 """
 
-import re
+from contextlib import contextmanager
+
+import maya.api.OpenMaya as om2
 import maya.cmds as mc
 
+# 名称近似匹配用的尾部符号集和关键词（模块加载时构建一次）
+# Maya 节点名只含 ASCII 字符，rstrip 该字符集等价于 re.sub(r'[\W_]+$', '', name)
+_TAIL_CHARS = ''.join(c for c in map(chr, range(128)) if not c.isalnum())
+# 左右标记两侧需同时包含（原为成对比较的 (x, x)，已去重为单个标记）
+_LR_TOKENS = ('eyel', 'eyer', '_l', '_r', 'l_', 'r_')
+_PARTS = frozenset(('eye', 'ball', 'vitreous', 'brow', 'lash', 'tooth', 'teeth', 'rope', 'necklace', 'gauntlets', 'skirt', 'body', 'tongue'))
+
 
 class BlendshapeManager:
     """BlendShape管理器（保留入口：create_precise_blendshapes_between_groups）"""
 
-    def __init__(self):
-        pass
+    def __init__(self, verbose=False):
+        self.verbose = verbose  # 是否输出逐对 mesh 的详细信息
+        self._log_buf = []  # 延迟输出的日志缓冲
 
     # ========== 入口函数（对外） ==========
 
@@ -46,185 +56,258 @@ class BlendshapeManager:
             print("❌ 组内未找到有效 mesh（需 intermediateObject=False 的 mesh）")
             return []
 
-        # 将驱动组按签名分组：sig=(faces, verts) -> [shape...]
-        sig_to_drv = {}
-        for s, inf in drv_info.items():
-            sig_to_drv.setdefault(inf['sig'], []).append(s)
-
-        created = []
-        matched = []
-        used_drv_shapes = set()
-
         print("\n开始匹配并创建 blendShape（驱动 -> 目标）...")
-        for t_shape, t_inf in tgt_info.items():
-            sig = t_inf['sig']
-            t_x = t_inf['xform']
-            t_key_nonns = t_inf['shortNoNS']
-
-            # 候选：faces+verts 相同的驱动形状，且未被用过
-            candidates = [s for s in sig_to_drv.get(sig, []) if s not in used_drv_shapes]
-            if not candidates:
-                continue
-
-            drv_best = self._pick_best_candidate(t_key_nonns, candidates, drv_info)
-            if not drv_best:
-                continue
-
-            d_x = drv_info[drv_best]['xform']
-            # 再确认 transform 下有有效 mesh
-            t_x_valid = self._get_valid_mesh_transform(t_x)
-            d_x_valid = self._get_valid_mesh_transform(d_x)
-            if not (t_x_valid and d_x_valid):
-                print("  跳过（无有效mesh）:", self._short(d_x), "->", self._short(t_x))
-                used_drv_shapes.add(drv_best)
-                continue
-
-            # 创建 blendShape：源 d_x_valid，目标 t_x_valid
-            try:
-                bs_name = 'bs_' + self._no_ns(self._short(t_x_valid))
-                blend = mc.blendShape(d_x_valid, t_x_valid, origin='world', name=bs_name)[0]
-                self._set_blend_weight(blend, d_x_valid, value=1.0)
-                created.append(blend)
-                matched.append((t_x_valid, d_x_valid))
-                used_drv_shapes.add(drv_best)
-                print("  ✅ {} -> {}  faces/verts={}  blend={}".format(
-                    self._short(d_x_valid), self._short(t_x_valid), sig, blend
-                ))
-            except Exception as e:
-                print("  ❌ 失败:", self._short(d_x_valid), "->", self._short(t_x_valid), "|", e)
-                used_drv_shapes.add(drv_best)
+        try:
+            with self._batch_edit():
+                created, matched = self._create_matched_blendshapes(tgt_info, drv_info)
+        finally:
+            self._flush_log()
 
         # 统计输出
-        print("\n=== 结果统计 ===")
-        print("目标组有效mesh数量:", len(tgt_info))
-        print("驱动组有效mesh数量:", len(drv_info))
-        print("成功创建blendShape:", len(created))
+        self._log("\n=== 结果统计 ===", detail=False)
+        self._log("目标组有效mesh数量: {}".format(len(tgt_info)), detail=False)
+        self._log("驱动组有效mesh数量: {}".format(len(drv_info)), detail=False)
+        self._log("成功创建blendShape: {}".format(len(created)), detail=False)
         if created:
-            print("\n创建的blendShape节点:")
+            self._log("\n创建的blendShape节点:")
             for b in created:
-                print("  -", b)
+                self._log("  - {}".format(b))
 
         matched_t = {t for t, _ in matched}
         matched_d = {d for _, d in matched}
 
         if len(matched_t) < len(tgt_info):
-            print("\n未匹配的 目标网格:")
+            self._log("\n未匹配的 目标网格:", detail=False)
             for s, inf in tgt_info.items():
                 if inf['xform'] not in matched_t:
-                    print("  - {} (faces/verts={})".format(self._short(inf['xform']), inf['sig']))
+                    self._log("  - {} (faces/verts={})".format(inf['shortX'], inf['sig']), detail=False)
 
         if len(matched_d) < len(drv_info):
-            print("\n未匹配的 驱动网格:")
+            self._log("\n未匹配的 驱动网格:", detail=False)
             for s, inf in drv_info.items():
                 if inf['xform'] not in matched_d:
-                    print("  - {} (faces/verts={})".format(self._short(inf['xform']), inf['sig']))
+                    self._log("  - {} (faces/verts={})".format(inf['shortX'], inf['sig']), detail=False)
 
+        self._flush_log()
         return created
 
     # ========== 内部工具 ==========
 
-    def _short(self, n):
-        return n.split('|')[-1]
+    @contextmanager
+    def _batch_edit(self):
+        # 批量创建期间：整批放在一个撤销块中（只产生一条撤销记录），
+        # 关闭并行求值、暂停视图刷新，避免每个 blendShape 都触发重绘；退出时恢复原状态
+        eval_mode = mc.evaluationManager(query=True, mode=True)[0]
+        # 嵌套在其他暂停刷新的代码中时，退出后需保持外层的暂停状态
+        refresh_suspended = mc.refresh(query=True, suspend=True)
 
-    def _no_ns(self, n):
-        return n.split(':')[-1]
-
-    def _is_valid_mesh_shape(self, shape):
+        mc.undoInfo(openChunk=True, chunkName='create_precise_blendshapes')
         try:
-            return mc.objExists(shape) and mc.nodeType(shape) == 'mesh' and not mc.getAttr(shape + '.intermediateObject')
-        except Exception:
-            return False
+            mc.evaluationManager(mode='off')
+            mc.refresh(suspend=True)
+            yield
+        finally:
+            mc.refresh(suspend=refresh_suspended)
+            mc.evaluationManager(mode=eval_mode)
+            mc.undoInfo(closeChunk=True)
+            # 恢复刷新后重绘一次视图
+            if not refresh_suspended:
+                mc.refresh()
+
+    def _create_matched_blendshapes(self, tgt_info, drv_info):
+        # 按签名+名称匹配驱动/目标并创建 blendShape
+        # 返回: (创建的 blendShape 节点列表, [(目标 transform, 驱动 transform)])
 
-    def _get_valid_mesh_shapes_under(self, root):
-        shapes = mc.listRelatives(root, ad=True, c=True, f=True, type='mesh') or []
-        return [s for s in shapes if self._is_valid_mesh_shape(s)]
+        # 将驱动组按签名分组：sig=(faces, verts) -> [shape...]
+        # 同时按短名（去命名空间）建立索引：shortNoNS -> [shape...]，精确匹配时直接查表
+        sig_to_drv = {}
+        drv_by_nonns = {}
+        for s, inf in drv_info.items():
+            sig_to_drv.setdefault(inf['sig'], []).append(s)
+            drv_by_nonns.setdefault(inf['shortNoNS'], []).append(s)
 
-    def _get_valid_mesh_transform(self, node):
-        # 输入 shape 或 transform，返回拥有至少一个有效 mesh shape 的 transform，否则 None
-        if not mc.objExists(node):
-            return None
-        x = node
-        if mc.nodeType(x) != 'transform':
-            p = mc.listRelatives(x, p=True, f=True) or []
-            x = p[0] if p else None
-        if not x:
+        # 目标组同样按签名分组，只遍历双方共有的签名
+        sig_to_tgt = {}
+        for t_shape, t_inf in tgt_info.items():
+            sig_to_tgt.setdefault(t_inf['sig'], []).append(t_shape)
+
+        created = []
+        matched = []
+        # 循环内频繁调用的方法绑定到局部变量
+        pick_best = self._pick_best_candidate
+        create_pair = self._create_pair_blendshape
+
+        for sig, t_shapes in sig_to_tgt.items():
+            d_shapes = sig_to_drv.get(sig)
+            if not d_shapes:
+                continue
+            # 签名唯一的一对一情况直接配对，无需候选筛选和名称匹配
+            one_to_one = len(t_shapes) == 1 and len(d_shapes) == 1
+
+            for t_shape in t_shapes:
+                t_inf = tgt_info[t_shape]
+                if one_to_one:
+                    drv_best = d_shapes[0]
+                else:
+                    # 候选：faces+verts 相同的驱动形状，且未被用过；用完后同签名的其余目标也无法匹配
+                    candidates = [s for s in d_shapes if not drv_info[s]['used']]
+                    if not candidates:
+                        break
+                    drv_best = pick_best(t_inf, candidates, drv_info, drv_by_nonns)
+                    if not drv_best:
+                        continue
+
+                # 无论创建成功与否，该驱动形状都不再参与后续匹配
+                d_inf = drv_info[drv_best]
+                d_inf['used'] = True
+                result = create_pair(t_inf, d_inf)
+                if result:
+                    blend, t_x_valid, d_x_valid = result
+                    created.append(blend)
+                    matched.append((t_x_valid, d_x_valid))
+
+        return created, matched
+
+    def _create_pair_blendshape(self, t_inf, d_inf):
+        # 为一对已匹配的目标/驱动创建 blendShape；返回 (blend, 目标 transform, 驱动 transform)，失败返回 None
+        # xform 来自 _build_mesh_info，均为拥有有效 mesh 的 transform，无需再次校验
+        t_short = t_inf['shortX']
+        d_short = d_inf['shortX']
+        t_x = t_inf['xform']
+        d_x = d_inf['xform']
+
+        # 创建 blendShape：源 d_x，目标 t_x
+        try:
+            blend = mc.blendShape(d_x, t_x, origin='world', name=t_inf['bsName'])[0]
+            self._set_blend_weight(blend, d_x, value=1.0)
+            self._log("  ✅ {} -> {}  faces/verts={}  blend={}".format(
+                d_short, t_short, t_inf['sig'], blend
+            ))
+            return blend, t_x, d_x
+        except Exception as e:
+            self._log("  ❌ 失败: {} -> {} | {}".format(d_short, t_short, e), detail=False)
             return None
-        shapes = mc.listRelatives(x, s=True, f=True) or []
-        return x if any(self._is_valid_mesh_shape(s) for s in shapes) else None
 
-    def _mesh_sig(self, shape):
-        return (mc.polyEvaluate(shape, face=True), mc.polyEvaluate(shape, vertex=True))
+    def _log(self, message, detail=True):
+        # 记录日志到缓冲区，由 _flush_log 统一输出，避免循环内逐行刷新 Script Editor
+        # detail：是否为逐对 mesh 的详细信息（仅 verbose 模式下记录）
+        if detail and not self.verbose:
+            return
+        self._log_buf.append(message)
+
+    def _flush_log(self):
+        # 一次性输出缓冲区中的日志
+        if self._log_buf:
+            print("\n".join(self._log_buf))
+            self._log_buf.clear()
+
+    def _short(self, n):
+        # 无路径分隔符时直接返回，否则只取最后一段，不构造完整的分段列表
+        return n if '|' not in n else n.rpartition('|')[2]
+
+    def _no_ns(self, n):
+        return n if ':' not in n else n.rpartition(':')[2]
+
+    def _iter_valid_mesh_paths(self, root):
+        # 通过 API 的 DAG 迭代器遍历 root 下的 mesh，跳过中间对象；
+        # 逐个产出 (shape MDagPath, transform MDagPath)，无需逐个 shape 调用命令查询
+        sel = om2.MSelectionList()
+        sel.add(root)
+        it = om2.MItDag(om2.MItDag.kDepthFirst, om2.MFn.kMesh)
+        it.reset(sel.getDagPath(0), om2.MItDag.kDepthFirst, om2.MFn.kMesh)
+        while not it.isDone():
+            shape_path = it.getPath()
+            if not om2.MFnDagNode(shape_path).isIntermediateObject:
+                xform_path = om2.MDagPath(shape_path)
+                xform_path.pop()
+                yield shape_path, xform_path
+            it.next()
+
+    def _mesh_sig(self, shape_path):
+        # 直接从 MFnMesh 读取面数/点数
+        mesh_fn = om2.MFnMesh(shape_path)
+        return (mesh_fn.numPolygons, mesh_fn.numVertices)
 
     def _build_mesh_info(self, root):
-        # 返回: shape -> dict(xform, sig, shortX, shortNoNS)
+        # 返回: shape -> dict(xform, sig, shortX, shortNoNS, nameLower, nameBase, bsName, used)
+        # nameLower/nameBase 为名称近似匹配用的小写名和去尾部符号后的小写名，每个 mesh 只计算一次
+        # 一次 DAG 遍历同时得到 shape、transform 和签名（有效 shape 的父节点即有效 transform）
         info = {}
-        for s in self._get_valid_mesh_shapes_under(root):
-            x = self._get_valid_mesh_transform(s)
-            if not x:
-                continue
-            info[s] = {
+        short, no_ns, mesh_sig = self._short, self._no_ns, self._mesh_sig
+        for shape_path, xform_path in self._iter_valid_mesh_paths(root):
+            x = xform_path.fullPathName()
+            short_x = short(x)
+            short_nonns = no_ns(short_x)
+            name_lower = short_nonns.lower()
+            info[shape_path.fullPathName()] = {
                 'xform': x,
-                'sig': self._mesh_sig(s),
-                'shortX': self._short(x),
-                'shortNoNS': self._no_ns(self._short(x)),
+                'sig': mesh_sig(shape_path),
+                'shortX': short_x,
+                'shortNoNS': short_nonns,
+                'nameLower': name_lower,
+                'nameBase': name_lower.rstrip(_TAIL_CHARS),
+                'bsName': 'bs_' + short_nonns,  # 作为目标时创建的 blendShape 节点名
+                'used': False,  # 作为驱动时是否已参与过匹配
             }
         return info
 
-    def _names_likely_same(self, a_short, b_short_nonns):
-        # a_short：驱动 transform 短名（可能带命名空间）；b_short_nonns：目标 transform 短名（无命名空间）
-        a = self._no_ns(a_short).lower()
-        b = b_short_nonns.lower()
+    def _names_likely_same(self, a_inf, b_inf):
+        # a_inf：驱动 mesh 信息；b_inf：目标 mesh 信息（使用预先计算的无命名空间小写短名）
+        a = a_inf['nameLower']
+        b = b_inf['nameLower']
         if a == b:
             return True
         # 去尾部非字母数字符号
-        a_base = re.sub(r'[\W_]+$', '', a)
-        b_base = re.sub(r'[\W_]+$', '', b)
-        if a_base == b_base:
-            return True
-        # 左右一致 + 常见部件关键词
-        lr_pairs = [('eyel', 'eyel'), ('eyer', 'eyer'), ('_l', '_l'), ('_r', '_r'), ('l_', 'l_'), ('r_', 'r_')]
-        parts = ['eye', 'ball', 'vitreous', 'brow', 'lash', 'tooth', 'teeth', 'rope', 'necklace', 'gauntlets', 'skirt', 'body', 'tongue']
-        if any(la in a and lb in b for la, lb in lr_pairs) and any(k in a and k in b for k in parts):
+        if a_inf['nameBase'] == b_inf['nameBase']:
             return True
+        # 左右一致 + 常见部件关键词（先过左右标记，部件只在 b 中检查 a 已包含的那些）
+        if any(t in a and t in b for t in _LR_TOKENS):
+            a_parts = [k for k in _PARTS if k in a]
+            if a_parts and any(k in b for k in a_parts):
+                return True
         # 上/下牙一致
         if ('upteeth' in a and 'upteeth' in b) or ('lowteeth' in a and 'lowteeth' in b):
             return True
         return False
 
-    def _pick_best_candidate(self, target_short_nonns, candidates, drv_info):
-        # 优先短名去命名空间完全一致
-        for s in candidates:
-            if self._no_ns(drv_info[s]['shortX']) == target_short_nonns:
-                return s
+    def _pick_best_candidate(self, t_inf, candidates, drv_info, drv_by_nonns):
+        # 优先短名去命名空间完全一致：从索引取同名驱动形状，按驱动组顺序取第一个仍在候选中的
+        same_name = drv_by_nonns.get(t_inf['shortNoNS'])
+        if same_name:
+            candidate_set = set(candidates)
+            for s in same_name:
+                if s in candidate_set:
+                    return s
         # 次选名称近似
+        names_likely_same = self._names_likely_same
         for s in candidates:
-            if self._names_likely_same(drv_info[s]['shortX'], target_short_nonns):
+            if names_likely_same(drv_info[s], t_inf):
                 return s
         # 否则取第一个
         return candidates[0] if candidates else None
 
     def _set_blend_weight(self, blend_node, driver_xform, value=1.0):
-        # 尝试通过别名设置；若无，退回 weight[0]
-        alias_direct = '{}.{}'.format(blend_node, self._short(driver_xform))
+        # 新建的单目标 blendShape 目标索引固定为 0，直接设置 weight[0]，无需查询别名
         try:
+            mc.setAttr('{}.w[0]'.format(blend_node), value)
+            return
+        except Exception as e:
+            error = e
+        # 回退：通过别名设置
+        try:
+            alias_direct = '{}.{}'.format(blend_node, self._short(driver_xform))
             if mc.objExists(alias_direct):
                 mc.setAttr(alias_direct, value)
                 return
             aliases = mc.aliasAttr(blend_node, q=True) or []
-            a_map = dict(zip(aliases[::2], aliases[1::2]))  # alias -> plug
             d_short_nonns = self._no_ns(self._short(driver_xform))
-            for alias in a_map.keys():
+            for alias in aliases[::2]:  # [alias, plug, alias, plug, ...]
                 if self._no_ns(alias) == d_short_nonns:
                     mc.setAttr('{}.{}'.format(blend_node, alias), value)
                     return
-            # 回退：权重 0
-            mc.setAttr('{}.w[0]'.format(blend_node), value)
-        except Exception as e:
-            # 最后回退
-            try:
-                mc.setAttr('{}.w[0]'.format(blend_node), value)
-            except Exception:
-                print("  ⚠️ 设置blendShape权重失败:", blend_node, "|", e)
+        except Exception:
+            pass
+        self._log("  ⚠️ 设置blendShape权重失败: {} | {}".format(blend_node, error), detail=False)
 
 
 # 可选：Script Editor 直接执行时的简单入口（选中：先目标组，后驱动组）
@@ -233,5 +316,5 @@ if __name__ == '__main__':
     if len(sel) != 2:
         mc.warning('请选择两个组：先选“目标组”（被驱动），再选“驱动组”（施加形变的来源）')
     else:
-        mgr = BlendshapeManager()
+        mgr = BlendshapeManager(verbose=True)
         mgr.create_precise_blendshapes_between_groups(sel[0], sel[1])
\ No newline at end of file
@@ -3,6 +3,7 @@ Lookdev管理模块
 负责处理Lookdev文件导入和相关管理功能
 """
 
+import maya.api.OpenMaya as om2
 import maya.cmds as cmds
 import os
 
@@ -86,19 +87,42 @@ class LookdevManager:
         lookdev_meshes = {}
         
         try:
-            # 查找命名空间下的所有transform
-            lookdev_transforms = cmds.ls(f"{namespace}:*", type='transform') or []
+            # 通过API一次解析命名空间下的所有节点，直接遍历子节点找mesh，
+            # 不再对每个transform单独调用listRelatives
+            selection = om2.MSelectionList()
+            try:
+                selection.add(f"{namespace}:*")
+            except RuntimeError:
+                # 命名空间下没有任何节点
+                selection = om2.MSelectionList()
             
-            for transform in lookdev_transforms:
-                # 获取mesh shape
-                shapes = cmds.listRelatives(transform, shapes=True, type='mesh') or []
-                if shapes:
+            for i in range(selection.length()):
+                try:
+                    transform_path = selection.getDagPath(i)
+                except TypeError:
+                    # 非DAG节点
+                    continue
+                
+                if not transform_path.node().hasFn(om2.MFn.kTransform):
+                    continue
+                
+                # 获取第一个mesh shape
+                for c in range(transform_path.childCount()):
+                    child = transform_path.child(c)
+                    if not child.hasFn(om2.MFn.kMesh):
+                        continue
+                    
+                    shape_path = om2.MDagPath(transform_path)
+                    shape_path.push(child)
+                    
                     # 使用transform的基础名称作为key
-                    base_name = transform.split(':')[-1].lower()
+                    transform = transform_path.partialPathName()
+                    base_name = transform.rpartition(':')[2].lower()
                     lookdev_meshes[base_name] = {
                         'transform': transform,
-                        'shape': shapes[0]
+                        'shape': shape_path.partialPathName()
                     }
+                    break
             
             print(f"找到 {len(lookdev_meshes)} 个Lookdev几何体")
             return lookdev_meshes
@@ -5,6 +5,7 @@
 
 import maya.cmds as cmds
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 
 class MaterialManager:
@@ -211,15 +212,20 @@ class MaterialManager:
             file_nodes = cmds.ls(type="file")
             stats['total_textures'] = len(file_nodes)
             
-            missing_count = 0
+            texture_paths = []
             for node in file_nodes:
                 try:
                     texture_path = cmds.getAttr(f"{node}.fileTextureName")
-                    if texture_path and not os.path.exists(texture_path):
-                        missing_count += 1
+                    if texture_path:
+                        texture_paths.append(texture_path)
                 except:
                     pass
-            stats['missing_textures'] = missing_count
+            
+            # Maya查询留在主线程；纹理多在网络盘上，路径检查是纯文件I/O，并行执行
+            unique_paths = list(set(texture_paths))
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                path_exists = dict(zip(unique_paths, executor.map(os.path.exists, unique_paths)))
+            stats['missing_textures'] = sum(1 for path in texture_paths if not path_exists[path])
             
             # 无材质mesh统计
             stats['unmaterialized_meshes'] = self._count_unmaterialized_meshes()
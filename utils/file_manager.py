@@ -77,12 +77,18 @@ class FileManager:
                 print(f"  🔍 搜索模式 {pattern}: 找到 {len(files)} 个文件")
                 
                 for file_path in files:
+                    # 一次stat同时完成存在性检查和大小读取
+                    try:
+                        file_size = os.stat(file_path).st_size
+                    except OSError:
+                        file_size = 0
+                    
                     file_info = {
                         'path': file_path,
                         'filename': os.path.basename(file_path),
                         'version': self._extract_version_number(version_dir),
                         'extension': ext,
-                        'size': os.path.getsize(file_path) if os.path.exists(file_path) else 0
+                        'size': file_size
                     }
                     maya_files.append(file_info)
                     print(f"  ✅ 找到文件: {file_info['filename']} (版本: {file_info['version']})")
@@ -156,9 +162,8 @@ class FileManager:
         
         # 搜索相机文件
         search_pattern = os.path.join(base_dir, pattern)
-        files = glob.glob(search_pattern)
         
-        for file_path in files:
+        for file_path in glob.iglob(search_pattern):
             if os.path.isfile(file_path):
                 version = self._extract_version_from_filename(os.path.basename(file_path))
                 file_info = {
@@ -59,15 +59,10 @@ class PathUtils:
                 
                 # 构建基础目录路径（去掉cache/vXXX部分）
                 # 从 .../element/ani/ani/cache/v002/... 变成 .../element/ani/ani/
-                parts = normalized_path.split('/')
-                cache_index = -1
-                for i, part in enumerate(parts):
-                    if part == 'cache':
-                        cache_index = i
-                        break
-                
+                # 在前面补一个分隔符后查找第一个名为cache的路径段，无需拆分整条路径
+                cache_index = ('/' + normalized_path).find('/cache/')
                 if cache_index > 0:
-                    result['base_dir'] = '/'.join(parts[:cache_index])
+                    result['base_dir'] = normalized_path[:cache_index - 1]
                     
         except Exception as e:
             print(f"提取镜头信息失败: {str(e)}")
@@ -105,25 +100,24 @@ class PathUtils:
             
             # 解析动画文件名
             if '_v' in animation_filename:
-                base_name_part = animation_filename.split('_v')[0]  # LHSN_s310_c0990_ani_ani
-                version_with_suffix = animation_filename.split('_v')[1]  # 002-chr_dwl_01.abc
+                base_name_part, _, version_with_suffix = animation_filename.partition('_v')  # LHSN_s310_c0990_ani_ani
+                # 只取到下一个 '_v' 之前的部分: 002-chr_dwl_01.abc
+                version_with_suffix = version_with_suffix.partition('_v')[0]
                 
                 # 提取版本号（处理可能有或没有后缀的情况）
                 if '-' in version_with_suffix:
-                    version_part = version_with_suffix.split('-')[0]  # 002
+                    version_part = version_with_suffix.partition('-')[0]  # 002
                 else:
-                    version_part = version_with_suffix.split('.')[0]  # 002 (从002.abc中提取)
+                    version_part = version_with_suffix.partition('.')[0]  # 002 (从002.abc中提取)
                 
                 print(f"      基础名称部分: {base_name_part}")
                 print(f"      版本部分: {version_part}")
                 
-                # 替换 ani 为 cam
-                base_parts = base_name_part.split('_')
-                print(f"      名称段: {base_parts}")
+                # 替换末尾的 ani 为 cam（名称至少需要5段）
+                name_head, _, name_tail = base_name_part.rpartition('_')
                 
-                if len(base_parts) >= 5 and base_parts[-1] == 'ani':
-                    base_parts[-1] = 'cam'
-                    camera_base_name = '_'.join(base_parts)
+                if base_name_part.count('_') >= 4 and name_tail == 'ani':
+                    camera_base_name = name_head + '_cam'
                     camera_filename = f"{camera_base_name}_v{version_part}.abc"
                     
                     print(f"      相机文件名: {camera_filename}")
@@ -174,9 +168,8 @@ class PathUtils:
         
         for pattern in patterns:
             search_pattern = os.path.join(directory, pattern)
-            files = glob.glob(search_pattern)
             
-            for file_path in files:
+            for file_path in glob.iglob(search_pattern):
                 if os.path.isfile(file_path):
                     file_info = self._analyze_camera_file(file_path, shot_info)
                     if file_info:
@@ -262,12 +255,18 @@ class PathUtils:
         """
         filename = os.path.basename(file_path)
         
+        # 一次stat同时完成存在性检查和大小读取
+        try:
+            file_size = os.stat(file_path).st_size
+        except OSError:
+            file_size = 0
+        
         file_info = {
             'path': file_path,
             'filename': filename,
             'version': self._extract_version_from_filename(filename),
             'match_score': 0,
-            'size': os.path.getsize(file_path) if os.path.exists(file_path) else 0
+            'size': file_size
         }
         
         # 计算匹配度